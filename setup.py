@@ -40,6 +40,7 @@ setup(
         "dev": [
             "pytest>=7.0",
             "pytest-cov>=4.0",
+            "pytest-xdist>=3.0",
             "black>=22.0",
             "flake8>=5.0",
             "mypy>=0.990",
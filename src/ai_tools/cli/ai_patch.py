@@ -5,6 +5,7 @@ import pyperclip
 
 # Import from new modular structure
 from ai_tools.utils.logger import log_error, log_error_non_fatal, log_info, log_success
+from ai_tools.utils.filesystem import write_text_file
 from ai_tools.core.patch_ops import parse_patch_content
 
 def main():
@@ -57,23 +58,31 @@ Działanie:
     log_info(f"Znaleziono {len(patches)} plików do aktualizacji.")
     error_count = 0
 
+    # Katalog bazowy liczymy raz; prefiks z separatorem odrzuca też '/foo' vs '/foobar'
+    base_abs = os.path.abspath(base_dir)
+    base_prefix = os.path.join(base_abs, '')
+    # Katalogi już utworzone w tym przebiegu - bez powtarzania makedirs
+    created_dirs = set()
+
     for path, content in patches:
         try:
             # Zapewnienie, że ścieżka jest względna i bezpieczna
-            target_path = os.path.normpath(os.path.join(base_dir, path))
-            if not os.path.abspath(target_path).startswith(os.path.abspath(base_dir)):
+            target_path = os.path.normpath(os.path.join(base_abs, path))
+            if not target_path.startswith(base_prefix):
                 log_error_non_fatal(f"Błąd bezpieczeństwa: Ścieżka '{path}' próbuje zapisać plik poza katalogiem projektu. Pomijam.")
                 error_count += 1
                 continue
 
             # Utworzenie katalogów, jeśli nie istnieją
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            target_dir = os.path.dirname(target_path)
+            if target_dir not in created_dirs:
+                os.makedirs(target_dir, exist_ok=True)
+                created_dirs.add(target_dir)
             
-            with open(target_path, 'w', encoding='utf-8') as f:
-                # Zapewnienie, że niepusty plik kończy się nową linią.
-                if content and not content.endswith('\n'):
-                    content += '\n'
-                f.write(content)
+            # Zapewnienie, że niepusty plik kończy się nową linią.
+            if content and not content.endswith('\n'):
+                content += '\n'
+            write_text_file(target_path, content)
 
             log_success(f"Zaktualizowano: {path}")
 
@@ -11,40 +11,85 @@ from ai_tools.utils.config import (
     CONFIG_FILENAME, create_default_config
 )
 from ai_tools.utils.logger import log_error, log_info, log_success, log_warning
-from ai_tools.utils.filesystem import format_file_content
+from ai_tools.utils.filesystem import count_lines, format_files
 from ai_tools.utils.temp_storage import (
     get_project_temp_dir, cleanup_old_dumps, list_recent_dumps,
-    format_file_size, parse_dump_file, get_dump_by_ref
+    format_file_size, parse_dump_file, get_dump_by_ref, write_dump_file
 )
 from ai_tools.core.file_filter import (
-    is_binary,
+    get_text_extensions,
+    looks_binary,
     normalize_path_pattern,
     is_directory_pattern,
-    find_most_specific_match,
-    validate_config_paths
+    compile_patterns,
+    find_compiled_match,
+    validate_config_paths,
+    format_config_conflicts
 )
 
-def run_git_command(command, cwd):
-    """Uruchamia polecenie git i zwraca jego wyjście."""
+# Polecenie zwracające staged, unstaged i untracked w jednym przebiegu gita
+GIT_STATUS_COMMAND = [
+    'git', '--no-optional-locks', 'status', '--porcelain=v2', '-z',
+    '--untracked-files=all', '--no-renames', '--ignore-submodules=all'
+]
+
+# Liczba pól przed ścieżką w rekordach porcelain v2 ('1' - zwykła zmiana, 'u' - konflikt)
+PORCELAIN_V2_PATH_FIELD = {b'1': 8, b'u': 10}
+
+def collect_changes(git_root, mode='all'):
+    """
+    Pobiera listę zmienionych plików jednym wywołaniem `git status`.
+
+    Parsuje format porcelain v2: w rekordach '1'/'u' kolumna X (index)
+    oznacza zmiany staged, kolumna Y (worktree) zmiany unstaged, a rekordy
+    '?' to pliki untracked.
+
+    Args:
+        git_root: Katalog główny repozytorium
+        mode: 'staged', 'unstaged' (wraz z untracked) lub 'all'
+
+    Returns:
+        Zbiór ścieżek względnych do git_root
+    """
     try:
-        return subprocess.check_output(command, text=True, encoding='utf-8', cwd=cwd).strip()
+        output = subprocess.check_output(GIT_STATUS_COMMAND, cwd=git_root)
     except (subprocess.CalledProcessError, FileNotFoundError) as e:
         log_error(f"Błąd wykonania polecenia git: {e}")
-        return ""
+        return set()
+
+    changes = set()
+    for record in output.split(b'\0'):
+        kind = record[0:1]
+        if kind == b'?':
+            path = record[2:]
+            is_staged, is_unstaged = False, True
+        elif kind in PORCELAIN_V2_PATH_FIELD:
+            fields = record.split(b' ', PORCELAIN_V2_PATH_FIELD[kind])
+            if len(fields) <= PORCELAIN_V2_PATH_FIELD[kind]:
+                continue
+            path = fields[-1]
+            x, y = fields[1][0:1], fields[1][1:2]
+            is_staged, is_unstaged = x != b'.', y != b'.'
+        else:
+            # Puste rekordy, pliki ignorowane ('!')
+            continue
 
-def get_files_by_status(command, cwd):
-    """Pobiera listę plików dla danego statusu git."""
-    output = run_git_command(command, cwd)
-    return [line.split('\t')[-1] for line in output.split('\n') if line]
+        if mode == 'all' or (mode == 'staged' and is_staged) or (mode == 'unstaged' and is_unstaged):
+            changes.add(path.decode('utf-8', 'surrogateescape'))
+    return changes
 
 def filter_files_by_config(files, project_root, config):
     """
     Filtruje pliki według blacklist/whitelist z konfiguracji.
     Używa tej samej logiki co w repo.py - bardziej specyficzna reguła wygrywa.
     """
-    whitelisted_patterns = config.get('whitelisted_paths', [])
-    blacklisted_patterns = config.get('blacklisted_paths', []) + ['.git/', '.gitignore']
-    config_file_abs = os.path.abspath(os.path.join(project_root, CONFIG_FILENAME))
+    # Wzorce kompilujemy raz, a nie przy każdym pliku
+    whitelist = compile_patterns(config.get('whitelisted_paths', []))
+    blacklist = compile_patterns(config.get('blacklisted_paths', []) + ['.git/', '.gitignore'])
+    project_root_abs = os.path.abspath(project_root)
+    project_prefix = os.path.join(project_root_abs, '')  # zawsze kończy się separatorem
+    config_file_abs = project_prefix + CONFIG_FILENAME
+    text_extensions = get_text_extensions(config)
     
     filtered_files = []
     
@@ -53,17 +98,21 @@ def filter_files_by_config(files, project_root, config):
         if os.path.isabs(file_path):
             abs_path = file_path
         else:
-            abs_path = os.path.join(project_root, file_path)
+            abs_path = project_prefix + file_path
         
-        # Pomiń pliki binarne i config file
-        if is_binary(abs_path) or abs_path == config_file_abs:
+        # Pomiń config file (tanie porównanie; looks_binary sprawdzamy na końcu)
+        if abs_path == config_file_abs:
             continue
         
-        rel_path = os.path.relpath(abs_path, project_root)
+        # Ścieżka względna przez obcięcie prefiksu zamiast os.path.relpath
+        if abs_path.startswith(project_prefix):
+            rel_path = abs_path[len(project_prefix):]
+        else:
+            rel_path = os.path.relpath(abs_path, project_root_abs)
         
         # Znajdź najbardziej specyficzne dopasowania
-        whitelist_match, whitelist_spec = find_most_specific_match(rel_path, whitelisted_patterns)
-        blacklist_match, blacklist_spec = find_most_specific_match(rel_path, blacklisted_patterns)
+        whitelist_match, whitelist_spec = find_compiled_match(rel_path, whitelist)
+        blacklist_match, blacklist_spec = find_compiled_match(rel_path, blacklist)
         
         # Logika decyzyjna (taka sama jak w repo.py)
         should_include = False
@@ -87,7 +136,8 @@ def filter_files_by_config(files, project_root, config):
             # Brak reguł - domyślnie załącz (plik był zwrócony przez git)
             should_include = True
         
-        if should_include:
+        # Pomiń pliki binarne - odczyt z dysku tylko dla plików, które przeszły reguły
+        if should_include and not looks_binary(abs_path, text_extensions):
             filtered_files.append(abs_path)
     
     return filtered_files
@@ -250,36 +300,33 @@ Co będzie dumpowane (domyślnie):
         return 0
     
     # Waliduj konfigurację przed rozpoczęciem pracy
-    validate_config_paths(config)
+    conflicts = validate_config_paths(config)
+    if conflicts:
+        log_error(format_config_conflicts(conflicts))
 
     if not git_root:
         log_error("Nie znajdujesz się w repozytorium Git.")
 
-    files_to_process = set()
-    dump_type = "git-all"
-
-    staged_files = get_files_by_status(['git', 'diff', '--name-only', '--cached'], git_root)
-    unstaged_files = get_files_by_status(['git', 'diff', '--name-only'], git_root)
-    untracked_files = get_files_by_status(['git', 'ls-files', '--others', '--exclude-standard'], git_root)
-
     if args.staged:
-        files_to_process.update(staged_files)
-        dump_type = "git-staged"
+        mode, dump_type = 'staged', "git-staged"
     elif args.unstaged:
-        files_to_process.update(unstaged_files)
-        files_to_process.update(untracked_files)
-        dump_type = "git-unstaged"
+        mode, dump_type = 'unstaged', "git-unstaged"
     else:
-        files_to_process.update(staged_files)
-        files_to_process.update(unstaged_files)
-        files_to_process.update(untracked_files)
+        mode, dump_type = 'all', "git-all"
+
+    files_to_process = collect_changes(git_root, mode)
     
     if not files_to_process:
         log_info("Brak zmian do zdumpowania.")
         return 0
 
-    # Ścieżki z git są względne do git_root, więc tworzymy ścieżki absolutne
-    absolute_paths = [os.path.join(git_root, path) for path in sorted(list(files_to_process))]
+    # Ścieżki z git są względne do git_root (zawsze z '/'), więc tworzymy ścieżki absolutne.
+    # Na POSIX zwykła konkatenacja jest dużo tańsza niż os.path.join w pętli.
+    if os.sep == '/':
+        git_prefix = os.path.join(git_root, '')
+        absolute_paths = [git_prefix + path for path in sorted(files_to_process)]
+    else:
+        absolute_paths = [os.path.join(git_root, path) for path in sorted(files_to_process)]
     
     # Filtruj pliki według blacklist/whitelist
     filtered_paths = filter_files_by_config(absolute_paths, project_root, config)
@@ -288,19 +335,14 @@ Co będzie dumpowane (domyślnie):
         log_info("Brak plików do zdumpowania po zastosowaniu filtrów.")
         return 0
     
-    # Zliczanie linii kodu i tokenów
-    total_lines = 0
-    all_content = []
-    for file_path in filtered_paths:
-        try:
-            if not os.path.exists(file_path): 
-                continue
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                total_lines += content.count('\n') + 1
-                all_content.append(content)
-        except IOError:
-            continue
+    # Jeden odczyt każdego pliku: formatowanie + statystyki z tej samej treści
+    hide_env = config.get('hide_env', True)
+    results = format_files(
+        filtered_paths, project_root, config.get('extension_lang_map', {}), hide_env=hide_env
+    )
+    output_parts = [formatted for formatted, _ in results]
+    all_content = [content for _, content in results if content is not None]
+    total_lines = sum(count_lines(content) for content in all_content)
 
     text_for_tokens = "\n\n".join(all_content)
     token_count_info = ""
@@ -312,12 +354,6 @@ Co będzie dumpowane (domyślnie):
         pass  # tiktoken not installed or other issue
 
     log_info(f"Znaleziono {len(filtered_paths)} zmienionych plików do przetworzenia (łącznie {total_lines:,} linii kodu{token_count_info}).".replace(',', ' '))
-    
-    hide_env = config.get('hide_env', True)
-    output_parts = [
-        format_file_content(path, project_root, config.get('extension_lang_map', {}), hide_env=hide_env) 
-        for path in filtered_paths
-    ]
 
     # Cleanup old dumps (>7 days)
     removed = cleanup_old_dumps(output_dir_path, max_age_days=7)
@@ -329,9 +365,7 @@ Co będzie dumpowane (domyślnie):
     output_path = os.path.join(output_dir_path, filename)
     
     try:
-        dump_text = "\n\n".join(output_parts)
-        with open(output_path, 'w', encoding='utf-8') as outfile:
-            outfile.write(dump_text)
+        dump_text = write_dump_file(output_path, output_parts)
         pyperclip.copy(dump_text)
     except IOError as e:
         log_error(f"Nie można zapisać do pliku '{output_path}': {e}")
@@ -1,6 +1,7 @@
 import argparse
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pyperclip
 import tiktoken
@@ -11,52 +12,154 @@ from ai_tools.utils.config import (
     CONFIG_FILENAME, create_default_config
 )
 from ai_tools.utils.logger import log_error, log_info, log_success, log_warning
-from ai_tools.utils.filesystem import format_file_content
+from ai_tools.utils.filesystem import MAX_READ_WORKERS, count_lines, format_files
 from ai_tools.utils.temp_storage import (
     get_project_temp_dir, cleanup_old_dumps, list_recent_dumps, 
-    format_file_size, parse_dump_file, get_dump_by_ref
+    format_file_size, parse_dump_file, get_dump_by_ref, write_dump_file
 )
 from ai_tools.core.file_filter import (
-    is_binary,
+    get_text_extensions,
+    looks_binary,
     normalize_path_pattern,
     is_directory_pattern,
-    find_most_specific_match,
-    validate_config_paths
+    compile_patterns,
+    find_compiled_match,
+    make_directory_pruner,
+    validate_config_paths,
+    format_config_conflicts
 )
 
 # --- POCZĄTEK NOWEJ IMPLEMENTACJI ---
+def _git_ls_files(git_root, args):
+    """Uruchamia `git ls-files -z` i zwraca ścieżki względne do git_root (None, jeśli git zawiódł)."""
+    try:
+        cmd = ['git', '-C', git_root, 'ls-files', '-z', *args]
+        output = subprocess.check_output(cmd, stderr=subprocess.PIPE)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    # Surowe bajty rozdzielone NUL; dekodujemy raz dla całego wyjścia,
+    # surrogateescape zachowuje ścieżki, które nie są poprawnym UTF-8
+    return [p for p in output.decode('utf-8', 'surrogateescape').split('\0') if p]
+
+def _absolute_git_paths(git_root, rel_paths):
+    """Zamienia ścieżki z gita (względne, z '/') na zbiór ścieżek absolutnych."""
+    if os.sep == '/':
+        # Git zwraca znormalizowane ścieżki z '/', więc wystarczy doklejenie prefiksu
+        git_prefix = os.path.join(git_root, '')
+        return {git_prefix + p for p in rel_paths}
+    return {os.path.normpath(os.path.join(git_root, p)) for p in rel_paths}
+
+def _list_git_files(git_root):
+    """Zwraca zbiór absolutnych ścieżek plików z `git ls-files` (respektuje .gitignore)."""
+    paths = _git_ls_files(git_root, ['--cached', '--others', '--exclude-standard'])
+    if paths is None:
+        log_warning("Polecenie 'git ls-files' zawiodło. Skanowanie ręczne bez uwzględnienia .gitignore.")
+        return set()
+    return _absolute_git_paths(git_root, paths)
+
+def _list_ignored_dirs(git_root):
+    """
+    Zwraca zbiór absolutnych ścieżek katalogów ignorowanych w całości przez .gitignore.
+
+    Z --directory git zgłasza katalog (z '/' na końcu) tylko wtedy, gdy nie
+    zawiera on żadnych śledzonych plików, więc cała jego zawartość jest ignorowana.
+    """
+    paths = _git_ls_files(git_root, ['--others', '--ignored', '--exclude-standard', '--directory'])
+    if not paths:
+        return set()
+    return _absolute_git_paths(git_root, [p.rstrip('/') for p in paths if p.endswith('/')])
+
+def _scan_project_files(project_root, should_prune):
+    """
+    Zwraca zbiór absolutnych ścieżek plików w projekcie (jedno przejście os.scandir).
+
+    DirEntry ma typ wpisu z readdir, więc nie potrzeba osobnego stat na plik.
+    Katalogi, dla których should_prune(ścieżka_względna) zwraca True, nie są
+    odwiedzane. Dowiązań do katalogów nie odwiedzamy (jak os.walk).
+    """
+    project_prefix = os.path.join(project_root, '')
+    prefix_len = len(project_prefix)
+    files = set()
+    pending = [project_prefix]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not should_prune(entry.path[prefix_len:]):
+                            pending.append(entry.path)
+                    elif entry.is_file():
+                        files.add(entry.path)
+                except OSError:
+                    continue
+    return files
+
 def get_files_to_dump(paths_to_scan, start_dir, project_root, git_root, config):
     whitelisted_patterns = config.get('whitelisted_paths', [])
     # Dodajemy .gitignore do domyślnej czarnej listy, aby sam plik nie był dumpowany
     blacklisted_patterns = config.get('blacklisted_paths', []) + ['.git/', '.gitignore']
     config_file_abs = os.path.abspath(os.path.join(project_root, CONFIG_FILENAME))
 
-    # Krok 1: Pobierz pliki z git (nieignorowane przez .gitignore)
-    files_from_git = set()
-    if git_root:
-        try:
-            cmd = ['git', '-C', git_root, 'ls-files', '--cached', '--others', '--exclude-standard', '-z']
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', check=True)
-            git_files_rel = (p for p in result.stdout.strip('\0').split('\0') if p)
-            files_from_git.update(os.path.normpath(os.path.join(git_root, p)) for p in git_files_rel)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            log_warning("Polecenie 'git ls-files' zawiodło. Skanowanie ręczne bez uwzględnienia .gitignore.")
+    # Wzorce kompilujemy raz, a nie przy każdym pliku
+    whitelist = compile_patterns(whitelisted_patterns)
+    blacklist = compile_patterns(blacklisted_patterns)
+    project_prefix = os.path.join(project_root, '')  # zawsze kończy się separatorem
+    prefix_len = len(project_prefix)
+
+    if not whitelisted_patterns:
+        # Bez whitelist do dumpu trafiają tylko pliki z `git ls-files`, więc
+        # skanowanie dysku niczego by nie dodało - bierzemy listę z gita
+        files_from_git = _list_git_files(git_root) if git_root else set()
+        all_files_in_project = {f_path for f_path in files_from_git if f_path.startswith(project_prefix)}
+    else:
+        # Krok 1: Uruchom git ls-files w tle (nieignorowane przez .gitignore),
+        # żeby proces gita pracował równolegle ze skanowaniem dysku w kroku 2
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            git_future = executor.submit(_list_git_files, git_root) if git_root else None
+
+            # Katalogi ignorowane w całości (np. node_modules/) - jedno wywołanie gita
+            # zamiast sprawdzania plików; bez whitelist w środku można je pominąć w skanowaniu
+            ignored_dirs = executor.submit(_list_ignored_dirs, git_root).result() if git_root else set()
+            ignored_rel_dirs = {
+                d[prefix_len:].replace(os.sep, '/') for d in ignored_dirs if d.startswith(project_prefix)
+            }
+            should_prune = make_directory_pruner(whitelisted_patterns, blacklisted_patterns, ignored_rel_dirs)
+
+            # Krok 2: Zbierz WSZYSTKIE pliki z systemu (dla whitelist),
+            # pomijając całe poddrzewa, z których i tak nic nie trafi do dumpu (np. .git/)
+            all_files_in_project = _scan_project_files(project_root, should_prune)
 
-    # Krok 2: Zbierz WSZYSTKIE pliki z systemu (dla whitelist)
-    all_files_in_project = set()
-    for root, _, files in os.walk(project_root):
-        for name in files:
-            all_files_in_project.add(os.path.join(root, name))
+            files_from_git = git_future.result() if git_future else set()
     
-    # Krok 3: Dla każdego pliku zastosuj logikę priorytetyzacji
-    final_files = set()
+    # Zakres: ścieżki podane przez użytkownika, sprawdzane razem z regułami
+    scan_paths_abs = [os.path.abspath(os.path.join(start_dir, p)) for p in paths_to_scan]
+    scan_prefixes = tuple(os.path.join(scan_path, '') for scan_path in scan_paths_abs)
+    # Zakres obejmujący cały projekt (domyślne '.') nie wymaga filtrowania
+    whole_project = project_prefix.startswith(scan_prefixes)
+    scan_paths_set = set(scan_paths_abs)
+
+    # Krok 3: Jedno przejście po plikach - zakres, plik konfiguracyjny
+    # i logika priorytetyzacji, bez pośrednich zbiorów
+    candidates = []
     
     for f_path in all_files_in_project:
-        rel_path = os.path.relpath(f_path, project_root)
+        # Ogranicz do ścieżek podanych przez użytkownika (startswith z krotką
+        # sprawdza wszystkie prefiksy naraz)
+        if not whole_project and not (f_path.startswith(scan_prefixes) or f_path in scan_paths_set):
+            continue
+        if f_path == config_file_abs:
+            continue
+        
+        # Ścieżka względna przez obcięcie prefiksu zamiast os.path.relpath
+        rel_path = f_path[prefix_len:]
         
         # Znajdź najbardziej specyficzne dopasowania w obu listach
-        whitelist_match, whitelist_spec = find_most_specific_match(rel_path, whitelisted_patterns)
-        blacklist_match, blacklist_spec = find_most_specific_match(rel_path, blacklisted_patterns)
+        whitelist_match, whitelist_spec = find_compiled_match(rel_path, whitelist)
+        blacklist_match, blacklist_spec = find_compiled_match(rel_path, blacklist)
         
         # Logika decyzyjna:
         should_include = False
@@ -81,24 +184,17 @@ def get_files_to_dump(paths_to_scan, start_dir, project_root, git_root, config):
             should_include = f_path in files_from_git
         
         if should_include:
-            final_files.add(f_path)
-    
-    # Krok 4: Ogranicz do ścieżek podanych przez użytkownika (zakres)
-    scan_paths_abs = [os.path.abspath(os.path.join(start_dir, p)) for p in paths_to_scan]
-    files_in_scope = set()
-    for f_path in final_files:
-        for scan_path in scan_paths_abs:
-            if f_path == scan_path or f_path.startswith(os.path.normpath(scan_path) + os.sep):
-                files_in_scope.add(f_path)
-                break
+            candidates.append(f_path)
 
-    # Krok 5: Ostateczne czyszczenie
-    final_files_cleaned = {
-        f_path for f_path in files_in_scope
-        if not (f_path == config_file_abs or is_binary(f_path))
-    }
+    # Krok 4: Ostateczne czyszczenie. Pliki ze znanym rozszerzeniem tekstowym
+    # nie są czytane; pozostałe sprawdzamy równolegle (I/O zwalnia GIL)
+    text_extensions = get_text_extensions(config)
+    with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+        binary_flags = executor.map(lambda f_path: looks_binary(f_path, text_extensions), candidates)
+        files_to_dump = [f_path for f_path, binary in zip(candidates, binary_flags) if not binary]
 
-    return sorted(list(final_files_cleaned))
+    files_to_dump.sort()
+    return files_to_dump
 
 def main():
     start_dir = os.getcwd()
@@ -257,7 +353,9 @@ Co będzie dumpowane (domyślnie):
         return 0
     
     # Waliduj konfigurację przed rozpoczęciem pracy
-    validate_config_paths(config)
+    conflicts = validate_config_paths(config)
+    if conflicts:
+        log_error(format_config_conflicts(conflicts))
 
     files_to_process = get_files_to_dump(args.paths, start_dir, project_root, git_root, config)
     
@@ -265,16 +363,14 @@ Co będzie dumpowane (domyślnie):
         log_info("Nie znaleziono żadnych plików pasujących do kryteriów.")
         return 0
 
-    total_lines = 0
-    all_content = []
-    for file_path in files_to_process:
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                total_lines += content.count('\n') + 1
-                all_content.append(content)
-        except IOError:
-            continue
+    # Jeden odczyt każdego pliku: formatowanie + statystyki z tej samej treści
+    hide_env = config.get('hide_env', True)
+    results = format_files(
+        files_to_process, project_root, config['extension_lang_map'], hide_env=hide_env
+    )
+    output_parts = [formatted for formatted, _ in results]
+    all_content = [content for _, content in results if content is not None]
+    total_lines = sum(count_lines(content) for content in all_content)
 
     text_for_tokens = "\n\n".join(all_content)
     token_count_info = ""
@@ -287,13 +383,6 @@ Co będzie dumpowane (domyślnie):
 
     log_info(f"Znaleziono {len(files_to_process)} plików do przetworzenia (łącznie {total_lines:,} linii kodu{token_count_info}).".replace(',', ' '))
 
-
-    hide_env = config.get('hide_env', True)
-    output_parts = [
-        format_file_content(f, project_root, config['extension_lang_map'], hide_env=hide_env) 
-        for f in files_to_process
-    ]
-    
     # Cleanup old dumps (>7 days)
     removed = cleanup_old_dumps(output_dir_path, max_age_days=7)
     if removed > 0:
@@ -304,9 +393,7 @@ Co będzie dumpowane (domyślnie):
     output_filepath = os.path.join(output_dir_path, output_filename)
 
     try:
-        dump_text = "\n\n".join(output_parts)
-        with open(output_filepath, 'w', encoding='utf-8') as outfile:
-            outfile.write(dump_text)
+        dump_text = write_dump_file(output_filepath, output_parts)
         pyperclip.copy(dump_text)
     except IOError as e:
         log_error(f"Nie można zapisać do pliku '{output_filepath}': {e}")
@@ -7,14 +7,23 @@ including blacklist/whitelist patterns with priority handling.
 
 import fnmatch
 import os
-from ai_tools.utils.logger import log_error
+import re
+from collections import namedtuple
+from functools import lru_cache
 from ai_tools.utils.config import CONFIG_FILENAME
 
 
-def is_binary(filepath, chunk_size=1024):
+# Open flags for binary probing (O_BINARY only exists on Windows)
+_BINARY_PROBE_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+
+def is_binary(filepath, chunk_size=4096):
     """
     Check if a file is binary by looking for null bytes.
     
+    Uses a raw file descriptor (os.open/os.read) instead of a buffered
+    file object; the default chunk is one page.
+    
     Args:
         filepath: Path to the file to check
         chunk_size: Number of bytes to read for detection
@@ -23,12 +32,55 @@ def is_binary(filepath, chunk_size=1024):
         True if file appears to be binary, False otherwise
     """
     try:
-        with open(filepath, 'rb') as f:
-            return b'\0' in f.read(chunk_size)
-    except IOError:
+        fd = os.open(filepath, _BINARY_PROBE_FLAGS)
+        try:
+            return b'\0' in os.read(fd, chunk_size)
+        finally:
+            os.close(fd)
+    except OSError:
         return True
 
 
+# Extensions treated as text without probing file content
+KNOWN_TEXT_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.md', '.txt', '.json', '.yaml', '.yml',
+    '.html', '.css', '.c', '.cpp', '.h', '.go', '.rs',
+})
+
+
+def get_text_extensions(config):
+    """
+    Build the set of extensions that skip binary detection.
+    
+    Args:
+        config: Configuration dictionary (uses 'extension_lang_map' keys)
+        
+    Returns:
+        Frozenset of lowercase extensions (with leading dot)
+    """
+    mapped = (ext.lower() for ext in (config.get('extension_lang_map') or {}) if isinstance(ext, str))
+    return KNOWN_TEXT_EXTENSIONS | frozenset(mapped)
+
+
+def looks_binary(filepath, text_extensions):
+    """
+    Check if a file should be skipped as binary, avoiding reads where possible.
+    
+    Files with a known text extension only need a stat (to skip deleted
+    files, like is_binary() does); other files are probed with is_binary().
+    
+    Args:
+        filepath: Path to the file to check
+        text_extensions: Extensions returned by get_text_extensions()
+        
+    Returns:
+        True if file is binary or unreadable, False otherwise
+    """
+    if os.path.splitext(filepath)[1].lower() in text_extensions:
+        return not os.path.isfile(filepath)
+    return is_binary(filepath)
+
+
 def normalize_path_pattern(pattern):
     """
     Normalize a path pattern for consistent matching.
@@ -59,11 +111,23 @@ def is_directory_pattern(pattern):
     return '*' not in pattern and '?' not in pattern and '[' not in pattern
 
 
+# Paths only need separator conversion where os.sep is not already '/'
+_NEEDS_SEP_CONVERSION = os.path.sep != '/'
+
+
+def _to_posix_path(path):
+    """Convert OS separators to '/', without allocating a copy on POSIX."""
+    if _NEEDS_SEP_CONVERSION:
+        return path.replace(os.path.sep, '/')
+    return path
+
+
 def is_path_match(rel_path, patterns):
     """
     Check if a relative path matches any of the given patterns.
     
     Supports both directory patterns (with/without trailing slash) and wildcards.
+    Uses the cached compile_patterns() result for the pattern list.
     
     Args:
         rel_path: Relative path to check
@@ -72,22 +136,119 @@ def is_path_match(rel_path, patterns):
     Returns:
         True if path matches any pattern, False otherwise
     """
-    path_to_check = rel_path.replace(os.path.sep, '/')
+    return find_most_specific_match(rel_path, patterns)[1] > 0
+
+
+# Compiled form of a pattern list: directory patterns keyed by their
+# normalized path (looked up once per ancestor of a path), plus one
+# alternation regex for wildcards with, for each named group, the
+# normalized pattern and its specificity; wildcard_spec is the highest
+# specificity among the wildcards
+CompiledPatterns = namedtuple('CompiledPatterns', ['directories', 'regex', 'groups', 'wildcard_spec'])
+
+
+def _pattern_specificity(normalized_pattern, is_directory):
+    """
+    Compute specificity of a pattern (higher values = more specific).
     
+    Directories score the number of path segments, wildcards score half a
+    segment less so an equally deep directory rule wins.
+    """
+    if is_directory:
+        return normalized_pattern.count('/') + 1
+    return normalized_pattern.count('/') + 0.5
+
+
+def compile_patterns(patterns):
+    """
+    Compile a list of blacklist/whitelist patterns for repeated matching.
+    
+    Directory patterns match the directory itself and everything below it;
+    they are stored in a dict so a path is checked with one lookup per
+    ancestor, independent of the number of patterns. Wildcard patterns
+    follow fnmatch semantics and are combined into a single regex whose
+    alternatives are ordered by descending specificity, so the first
+    alternative that matches a path is also the most specific one.
+    
+    Args:
+        patterns: List of patterns to compile
+        
+    Returns:
+        CompiledPatterns tuple (regex is None without wildcard patterns)
+    """
+    directories = {}
+    prepared = []
     for pattern in patterns:
         normalized_pattern = normalize_path_pattern(pattern)
-        
-        # Directory pattern (no wildcards)
         if is_directory_pattern(pattern):
-            # Check if path is in this directory or is this directory
-            if path_to_check.startswith(normalized_pattern + '/') or path_to_check == normalized_pattern:
-                return True
+            directories[normalized_pattern] = _pattern_specificity(normalized_pattern, True)
+        else:
+            prepared.append((
+                _pattern_specificity(normalized_pattern, False),
+                normalized_pattern,
+                fnmatch.translate(normalized_pattern)
+            ))
+    
+    if not prepared:
+        return CompiledPatterns(directories, None, {}, 0)
+    
+    # Stable sort keeps the original order among equally specific patterns
+    prepared.sort(key=lambda item: -item[0])
+    
+    alternatives = []
+    groups = {}
+    for index, (specificity, normalized_pattern, body) in enumerate(prepared):
+        group_name = f'p{index}'
+        alternatives.append(f'(?P<{group_name}>{body})')
+        groups[group_name] = (normalized_pattern, specificity)
+    
+    return CompiledPatterns(
+        directories, re.compile('|'.join(alternatives), re.DOTALL), groups, prepared[0][0]
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile_patterns_cached(patterns):
+    """Cache compiled patterns for callers passing plain pattern lists."""
+    return compile_patterns(patterns)
+
+
+def find_compiled_match(rel_path, compiled):
+    """
+    Find the most specific pattern from a compiled pattern list matching a path.
+    
+    Args:
+        rel_path: Relative path to check
+        compiled: CompiledPatterns returned by compile_patterns()
         
-        # Wildcard pattern - use fnmatch
-        if fnmatch.fnmatch(path_to_check, normalized_pattern):
-            return True
-            
-    return False
+    Returns:
+        Tuple of (matched_pattern, specificity) or (None, 0) if no match
+    """
+    rel_path = _to_posix_path(rel_path)
+    best = (None, 0)
+    
+    directories = compiled.directories
+    if directories:
+        # The deepest matching ancestor (or the path itself) is the most specific
+        if rel_path in directories:
+            best = (rel_path, directories[rel_path])
+        else:
+            end = rel_path.rfind('/')
+            while end != -1:
+                ancestor = rel_path[:end]
+                if ancestor in directories:
+                    best = (ancestor, directories[ancestor])
+                    break
+                end = rel_path.rfind('/', 0, end)
+    
+    # Skip the regex when no wildcard could beat the directory match
+    if compiled.regex is not None and compiled.wildcard_spec > best[1]:
+        match = compiled.regex.match(rel_path)
+        # Specificities of directories (whole) and wildcards (halves) never tie
+        if match and compiled.groups[match.lastgroup][1] > best[1]:
+            best = compiled.groups[match.lastgroup]
+    
+    return best
 
 
 def find_most_specific_match(rel_path, patterns):
@@ -104,42 +265,80 @@ def find_most_specific_match(rel_path, patterns):
     Returns:
         Tuple of (matched_pattern, specificity) or (None, 0) if no match
     """
-    path_to_check = rel_path.replace(os.path.sep, '/')
-    best_match = None
-    best_specificity = 0
+    return find_compiled_match(rel_path, _compile_patterns_cached(tuple(patterns)))
+
+
+def make_directory_pruner(whitelisted_patterns, blacklisted_patterns, ignored_dirs=frozenset()):
+    """
+    Build a predicate telling whether a directory walk can skip a subtree.
     
-    for pattern in patterns:
-        normalized_pattern = normalize_path_pattern(pattern)
-        
-        matches = False
-        specificity = 0
+    A directory can be pruned only when every file below it would be
+    excluded anyway: a blacklisted directory pattern covers it (or git
+    ignores it entirely) and no whitelist pattern could match a file
+    inside it with higher specificity.
+    
+    Args:
+        whitelisted_patterns: List of whitelist patterns
+        blacklisted_patterns: List of blacklist patterns
+        ignored_dirs: Set of directories (relative, '/'-separated) whose
+            files are all ignored by git
         
+    Returns:
+        Function taking a directory path relative to the project root and
+        returning True if the whole subtree can be skipped
+    """
+    blacklist_dirs = compile_patterns([p for p in blacklisted_patterns if is_directory_pattern(p)])
+    whitelist_dirs = []
+    whitelist_wildcard_spec = 0
+    for pattern in whitelisted_patterns:
+        normalized_pattern = normalize_path_pattern(pattern)
         if is_directory_pattern(pattern):
-            # Directory: check prefix match
-            if path_to_check.startswith(normalized_pattern + '/') or path_to_check == normalized_pattern:
-                matches = True
-                # Specificity = number of path segments (more segments = more specific)
-                specificity = normalized_pattern.count('/') + 1
-        elif fnmatch.fnmatch(path_to_check, normalized_pattern):
-            # Wildcard: also matches, but with lower specificity
-            matches = True
-            specificity = normalized_pattern.count('/') + 0.5  # Wildcards are less specific
+            whitelist_dirs.append((normalized_pattern, _pattern_specificity(normalized_pattern, True)))
+        else:
+            # Wildcards may match anywhere below the directory ('*' matches '/')
+            whitelist_wildcard_spec = max(
+                whitelist_wildcard_spec, _pattern_specificity(normalized_pattern, False)
+            )
+    
+    def whitelist_may_match_below(rel_dir, min_spec):
+        """Check if a whitelist rule more specific than min_spec may match inside rel_dir."""
+        if whitelist_wildcard_spec > min_spec:
+            return True
         
-        if matches and specificity > best_specificity:
-            best_match = normalized_pattern
-            best_specificity = specificity
+        dir_prefix = rel_dir + '/'
+        for whitelisted_dir, whitelist_spec in whitelist_dirs:
+            # Whitelisted path inside (or equal to) this directory
+            if whitelisted_dir == rel_dir or whitelisted_dir.startswith(dir_prefix):
+                return True
+            # Whitelisted ancestor that is more specific than the excluding rule
+            if whitelist_spec > min_spec and dir_prefix.startswith(whitelisted_dir + '/'):
+                return True
+        return False
+    
+    def should_prune(rel_dir):
+        rel_dir = _to_posix_path(rel_dir)
+        _, blacklist_spec = find_compiled_match(rel_dir, blacklist_dirs)
+        if blacklist_spec > 0:
+            return not whitelist_may_match_below(rel_dir, blacklist_spec)
+        if rel_dir in ignored_dirs:
+            return not whitelist_may_match_below(rel_dir, 0)
+        return False
     
-    return (best_match, best_specificity)
+    return should_prune
 
 
 def validate_config_paths(config):
     """
     Validate configuration for conflicts between whitelist and blacklist.
     
-    Raises an error if the same normalized path appears in both lists.
+    Finds normalized paths that appear in both lists. Reporting the
+    conflicts (and exiting) is left to the caller.
     
     Args:
         config: Configuration dictionary with 'whitelisted_paths' and 'blacklisted_paths'
+        
+    Returns:
+        Sorted list of conflicting normalized paths (empty if valid)
     """
     whitelisted = config.get('whitelisted_paths', [])
     blacklisted = config.get('blacklisted_paths', [])
@@ -148,16 +347,25 @@ def validate_config_paths(config):
     normalized_whitelist = {normalize_path_pattern(p) for p in whitelisted}
     normalized_blacklist = {normalize_path_pattern(p) for p in blacklisted}
     
-    # Find conflicts
-    conflicts = normalized_whitelist & normalized_blacklist
+    return sorted(normalized_whitelist & normalized_blacklist)
+
+
+def format_config_conflicts(conflicts):
+    """
+    Build the error message for conflicts returned by validate_config_paths().
     
-    if conflicts:
-        conflicts_list = ', '.join(f'"{c}"' for c in sorted(conflicts))
-        log_error(
-            f"NIEPRAWIDŁOWA KONFIGURACJA: Następujące ścieżki występują zarówno "
-            f"w whitelisted_paths jak i blacklisted_paths: {conflicts_list}. "
-            f"Usuń konflikty z pliku konfiguracyjnego '{CONFIG_FILENAME}'."
-        )
+    Args:
+        conflicts: Non-empty list of conflicting paths
+        
+    Returns:
+        Error message naming the conflicting paths
+    """
+    conflicts_list = ', '.join(f'"{c}"' for c in conflicts)
+    return (
+        f"NIEPRAWIDŁOWA KONFIGURACJA: Następujące ścieżki występują zarówno "
+        f"w whitelisted_paths jak i blacklisted_paths: {conflicts_list}. "
+        f"Usuń konflikty z pliku konfiguracyjnego '{CONFIG_FILENAME}'."
+    )
 
 
 def filter_files_by_rules(files, project_root, config):
@@ -175,10 +383,21 @@ def filter_files_by_rules(files, project_root, config):
     Returns:
         List of absolute file paths that should be included
     """
-    whitelisted_patterns = config.get('whitelisted_paths', [])
-    blacklisted_patterns = config.get('blacklisted_paths', [])
-    output_dir_abs = os.path.abspath(os.path.join(project_root, config['output_dir']))
-    config_file_abs = os.path.abspath(os.path.join(project_root, CONFIG_FILENAME))
+    whitelist = compile_patterns(config.get('whitelisted_paths', []))
+    blacklist = compile_patterns(config.get('blacklisted_paths', []))
+    project_root_abs = os.path.abspath(project_root)
+    project_prefix = os.path.join(project_root_abs, '')
+    config_file_abs = project_prefix + CONFIG_FILENAME
+    
+    # Output directory is optional (dumps default to the system temp dir);
+    # the separator-terminated prefix keeps '/a/out' from matching '/a/outsider'
+    skip_exact = {config_file_abs}
+    skip_prefixes = ()
+    output_dir = config.get('output_dir')
+    if output_dir:
+        output_dir_abs = os.path.abspath(os.path.join(project_root_abs, output_dir))
+        skip_exact.add(output_dir_abs)
+        skip_prefixes = (os.path.join(output_dir_abs, ''),)
     
     filtered_files = []
     
@@ -187,17 +406,23 @@ def filter_files_by_rules(files, project_root, config):
         if os.path.isabs(file_path):
             abs_path = file_path
         else:
-            abs_path = os.path.join(project_root, file_path)
+            abs_path = project_prefix + file_path
         
-        # Skip binary files, output directory, and config file
-        if is_binary(abs_path) or abs_path.startswith(output_dir_abs) or abs_path == config_file_abs:
+        # Skip output directory and config file (cheap string checks first)
+        if abs_path in skip_exact or abs_path.startswith(skip_prefixes):
+            continue
+        if is_binary(abs_path):
             continue
         
-        rel_path = os.path.relpath(abs_path, project_root)
+        # Relative path by slicing off the project prefix instead of os.path.relpath
+        if abs_path.startswith(project_prefix):
+            rel_path = abs_path[len(project_prefix):]
+        else:
+            rel_path = os.path.relpath(abs_path, project_root_abs)
         
         # Find most specific matches in both lists
-        whitelist_match, whitelist_spec = find_most_specific_match(rel_path, whitelisted_patterns)
-        blacklist_match, blacklist_spec = find_most_specific_match(rel_path, blacklisted_patterns)
+        whitelist_match, whitelist_spec = find_compiled_match(rel_path, whitelist)
+        blacklist_match, blacklist_spec = find_compiled_match(rel_path, blacklist)
         
         # Decision logic: more specific rule wins
         should_include = False
@@ -4,6 +4,7 @@ Patch parsing and application operations.
 Functions for parsing AI-generated patches and applying them to files.
 """
 
+import posixpath
 import re
 from ai_tools.utils.logger import log_warning
 
@@ -17,6 +18,18 @@ FILE_PATH_PATTERN = re.compile(
 # Markdown characters that can wrap a path
 MARKDOWN_STRIP_CHARS = r"*`_[]()<>!"
 
+# Pattern for code fence markers (``` or ~~~, optionally followed by info string)
+CODE_FENCE_PATTERN = re.compile(r"([`~]{3,})([^\s]*)")
+
+# Pattern for a bare fence marker (used to find the end of a closing tag)
+CLOSING_FENCE_PATTERN = re.compile(r"[`~]{3,}")
+
+# Pattern for a run of fence characters of any length
+FENCE_CHARS_PATTERN = re.compile(r"[`~]+")
+
+# Pattern for a backtick fence opening the text (after leading whitespace)
+LEADING_FENCE_PATTERN = re.compile(r"\s*```")
+
 
 def _clean_markdown_wrappers(token):
     """
@@ -50,7 +63,9 @@ def _extract_path_from_text(text):
     """
     Extract file path from text by splitting on whitespace and checking tokens.
     
-    Returns the last found path or None.
+    Returns the last found path or None. Tokens are scanned from the end;
+    once a valid path is found, earlier tokens are only checked for '..'
+    so every rejected path traversal candidate is still logged.
     Rejects paths with path traversal (..) as a security risk.
     
     Args:
@@ -59,9 +74,14 @@ def _extract_path_from_text(text):
     Returns:
         Last found file path or None
     """
-    found_paths = []
-    
-    for token in text.split():
+    found = None
+    for token in reversed(text.split()):
+        # Every path has an extension; cleaning only removes characters,
+        # so tokens without a dot (most prose) can skip cleaning and the regex.
+        # After a match only traversal candidates still need a warning.
+        if ('..' if found else '.') not in token:
+            continue
+        
         cleaned = _clean_markdown_wrappers(token)
         
         # Remove @ prefix (e.g. @alias/utils.js)
@@ -70,38 +90,80 @@ def _extract_path_from_text(text):
         
         # Check if token matches path pattern
         if FILE_PATH_PATTERN.match(cleaned):
-            # SECURITY: Reject paths trying to escape directory (path traversal)
-            if cleaned.startswith('..'):
+            # SECURITY: Reject paths trying to escape directory (path traversal),
+            # also when '..' segments appear in the middle (src/../../x.py)
+            normalized = posixpath.normpath(cleaned.replace('\\', '/'))
+            if normalized == '..' or normalized.startswith('../'):
                 log_warning(
                     f"Odrzucono ścieżkę z path traversal "
                     f"(potencjalne zagrożenie bezpieczeństwa): '{cleaned}'"
                 )
                 continue
-            found_paths.append(cleaned)
+            if found is None:
+                found = cleaned
     
-    # Return last found path (according to original logic)
-    return found_paths[-1] if found_paths else None
+    return found
 
 
-def _find_blocks_with_regex(text):
+def _iter_fences(text):
     """
-    Find top-level code blocks in text.
+    Yield the same matches as CODE_FENCE_PATTERN.finditer(text), faster.
+    
+    Candidate positions are located with str.find, which skips prose in C
+    (memchr) instead of stepping the regex engine over every character;
+    the pattern itself only runs where a fence character was found.
+    
+    Args:
+        text: Text to search for fence markers
+        
+    Yields:
+        Match objects with groups (marker, info)
+    """
+    pos = 0
+    next_backtick = text.find('`')
+    next_tilde = text.find('~')
+    
+    while next_backtick != -1 or next_tilde != -1:
+        if next_tilde == -1 or (next_backtick != -1 and next_backtick < next_tilde):
+            start = next_backtick
+        else:
+            start = next_tilde
+        
+        match = CODE_FENCE_PATTERN.match(text, start)
+        if match:
+            yield match
+            pos = match.end()
+        else:
+            # Too short for a fence; no position inside the run can start one
+            pos = FENCE_CHARS_PATTERN.match(text, start).end()
+        
+        # Each character type is searched again only once it has been passed
+        if next_backtick != -1 and next_backtick < pos:
+            next_backtick = text.find('`', pos)
+        if next_tilde != -1 and next_tilde < pos:
+            next_tilde = text.find('~', pos)
+
+
+def _iter_blocks(text):
+    """
+    Yield top-level code blocks in text, in order, without copying their content.
     
     Ignores indentation and is flexible with opening/closing marker locations.
+    Unclosed blocks are reported once the whole text has been scanned.
     
     Args:
         text: Text to search for code blocks
         
-    Returns:
-        List of tuples (opening_tag_start, content_start, content_end, content)
+    Yields:
+        Tuples (opening_tag_start, content_start, content_end)
     """
-    pattern = re.compile(r"([`~]{3,})([^\s]*)")
     stack = []
-    found_blocks = []
+    # End of the line holding the latest fence; reused while later fences
+    # sit on the same line, so finding line ends stays linear overall
+    line_end_pos = -1
     
-    for match in pattern.finditer(text):
+    for match in _iter_fences(text):
         marker, info = match.groups()
-        line_number = text.count('\n', 0, match.start()) + 1
         
         if stack:
             parent_block = stack[-1]
@@ -119,36 +181,86 @@ def _find_blocks_with_regex(text):
                     if end_offset > 0 and text[end_offset - 1] == '\n':
                         end_offset -= 1
                     
-                    content = text[start_offset:end_offset]
-                    # Return 4-element tuple with opening tag position
-                    found_blocks.append((
-                        closed_block["opening_tag_start"],
-                        start_offset,
-                        end_offset,
-                        content
-                    ))
+                    yield closed_block["opening_tag_start"], start_offset, end_offset
                 continue
         
-        line_end_pos = text.find('\n', match.end())
-        if line_end_pos == -1:
-            content_start = len(text)
-        else:
-            content_start = line_end_pos + 1
+        if line_end_pos < match.end():
+            line_end_pos = text.find('\n', match.end())
+            if line_end_pos == -1:
+                line_end_pos = len(text)
+        content_start = min(line_end_pos + 1, len(text))
         
         stack.append({
             "marker": marker,
             "info": info,
-            "line_number": line_number,
             "content_start_offset": content_start,
             "opening_tag_start": match.start()  # Save opening tag position
         })
     
     if stack:
+        # Line numbers are only needed for this warning, so they are computed
+        # here instead of being tracked for every fence; the stack is ordered
+        # by position, so each count continues from the previous block
+        line_number = 1
+        counted_up_to = 0
         for open_block in stack:
-            log_warning(f"Niezamknięty blok kodu, który został otwarty w linii {open_block['line_number']}")
+            line_number += text.count('\n', counted_up_to, open_block["opening_tag_start"])
+            counted_up_to = open_block["opening_tag_start"]
+            log_warning(f"Niezamknięty blok kodu, który został otwarty w linii {line_number}")
+
+
+def _find_blocks_with_regex(text):
+    """
+    Find top-level code blocks in text.
+    
+    List form of _iter_blocks() that also slices out each block's content.
     
-    found_blocks.sort(key=lambda b: b[0])
-    return found_blocks
+    Args:
+        text: Text to search for code blocks
+        
+    Returns:
+        List of tuples (opening_tag_start, content_start, content_end, content)
+    """
+    # Top-level blocks never overlap and are closed left to right,
+    # so they are already ordered by opening position
+    return [
+        (opening_tag_start, content_start, content_end, text[content_start:content_end])
+        for opening_tag_start, content_start, content_end in _iter_blocks(text)
+    ]
+
+
+def _unwrap_outer_code_block(text):
+    """
+    Return the inside of a code block that wraps the whole text, if any.
+    
+    The opening fence may carry an alphanumeric language tag. Plain string
+    operations are used instead of a lazy regex fullmatch, which had to
+    scan the whole input, and the text is only stripped (copied) once it
+    is known to start with a fence.
+    
+    Args:
+        text: Text that may be wrapped in a single code block
+        
+    Returns:
+        Inner content, or None if the text is not wrapped
+    """
+    if not LEADING_FENCE_PATTERN.match(text):
+        return None
+    
+    stripped = text.strip()
+    if not stripped.endswith('\n```'):
+        return None
+    
+    first_newline = stripped.find('\n')
+    closing_start = len(stripped) - 4
+    if first_newline >= closing_start:
+        return None
+    
+    info = stripped[3:first_newline]
+    if info and not (info.isascii() and info.isalnum()):
+        return None
+    
+    return stripped[first_newline + 1:closing_start]
 
 
 def parse_patch_content(text):
@@ -163,24 +275,21 @@ def parse_patch_content(text):
     Returns:
         List of tuples (file_path, code_content)
     """
-    if not text or not text.strip():
+    # Without a fence character there can be no code block; skip all scanning
+    if not text or ('`' not in text and '~' not in text):
         return []
     
-    stripped_content = text.strip()
-    outer_block_match = re.fullmatch(r"```[a-zA-Z0-9]*\n(.*?)\n```", stripped_content, re.DOTALL)
-    if outer_block_match:
-        content_to_parse = outer_block_match.group(1)
-    else:
+    content_to_parse = _unwrap_outer_code_block(text)
+    if content_to_parse is None:
         content_to_parse = text
     
-    found_blocks = _find_blocks_with_regex(content_to_parse)
-    if not found_blocks:
-        return []
-    
     patches = []
     last_block_end = 0
     
-    for opening_tag_start, block_start, block_end, code_content in found_blocks:
+    # Blocks are consumed as they are found; each content is sliced only here
+    for opening_tag_start, block_start, block_end in _iter_blocks(content_to_parse):
+        # Stripped once here; both branches below reuse the same string
+        code_content = content_to_parse[block_start:block_end].strip()
         # SEARCH SPACE ENDS NOW BEFORE THE OPENING TAG
         search_space = content_to_parse[last_block_end:opening_tag_start]
         
@@ -190,19 +299,19 @@ def parse_patch_content(text):
         if path:
             # Normalize path (replace backslashes with forward slashes)
             path = path.replace('\\', '/')
-            stripped_code_content = code_content.strip()
-            patches.append((path, stripped_code_content))
+            patches.append((path, code_content))
         else:
-            block_preview = code_content.strip().split('\n', 1)[0] if code_content.strip() else ""
+            block_preview = code_content.split('\n', 1)[0]
             log_warning(
                 f"Pominięto blok kodu, bo nie znaleziono dla niego prawidłowej ścieżki: "
                 f"'{block_preview[:70]}...'"
             )
         
         # Find position of closing tag end to properly set `last_block_end`
-        closing_tag_match = re.search(r'[`~]{3,}', content_to_parse[block_end:])
+        # (search from an offset instead of slicing, which copied the rest of the text per block)
+        closing_tag_match = CLOSING_FENCE_PATTERN.search(content_to_parse, block_end)
         if closing_tag_match:
-            last_block_end = block_end + closing_tag_match.end()
+            last_block_end = closing_tag_match.end()
         else:
             last_block_end = block_end  # Fallback
     
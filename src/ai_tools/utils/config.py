@@ -9,9 +9,71 @@ import subprocess
 import tempfile
 import yaml
 
+# Prefer the libyaml-backed loader (C extension); fall back to pure Python
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 CONFIG_FILENAME = ".ai-tools-config.yaml"
 
+# Default extension to language mapping (most popular languages)
+DEFAULT_EXTENSION_MAP = {
+    # Web
+    '.js': 'javascript',
+    '.jsx': 'jsx',
+    '.ts': 'typescript',
+    '.tsx': 'tsx',
+    '.html': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.sass': 'sass',
+    '.less': 'less',
+    '.vue': 'vue',
+
+    # Backend
+    '.py': 'python',
+    '.rb': 'ruby',
+    '.php': 'php',
+    '.java': 'java',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.cs': 'csharp',
+    '.swift': 'swift',
+    '.kt': 'kotlin',
+
+    # Data & Config
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.toml': 'toml',
+    '.xml': 'xml',
+    '.sql': 'sql',
+    '.graphql': 'graphql',
+
+    # Shell & Scripts
+    '.sh': 'bash',
+    '.bash': 'bash',
+    '.zsh': 'zsh',
+    '.fish': 'fish',
+    '.ps1': 'powershell',
+
+    # Documentation
+    '.md': 'markdown',
+    '.mdx': 'mdx',
+    '.rst': 'rst',
+    '.txt': 'text',
+
+    # Other
+    '.r': 'r',
+    '.lua': 'lua',
+    '.dart': 'dart',
+    '.elm': 'elm',
+}
+
 
 def get_default_output_dir():
     """
@@ -155,6 +217,28 @@ def find_git_root(start_path):
         return None
 
 
+def _default_config():
+    """Build a fresh default configuration dictionary."""
+    return {
+        'output_dir': None,  # Will be set to temp dir by tools
+        'blacklisted_paths': [],
+        'whitelisted_paths': [],
+        'extension_lang_map': DEFAULT_EXTENSION_MAP.copy(),
+        'hide_env': True  # Hide sensitive values from .env files by default
+    }
+
+
+def _read_user_config(config_path):
+    """Parse the user's YAML config file (empty dict for an empty file)."""
+    from ai_tools.utils.logger import log_error
+    
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=_YamlLoader) or {}
+    except (yaml.YAMLError, IOError) as e:
+        log_error(f"Nie można odczytać lub przetworzyć pliku '{config_path}': {e}")
+
+
 def get_config(project_root):
     """
     Load configuration from .ai-tools-config.yaml file.
@@ -167,89 +251,20 @@ def get_config(project_root):
     Returns:
         Dictionary with configuration values
     """
-    # Default extension to language mapping (most popular languages)
-    DEFAULT_EXTENSION_MAP = {
-        # Web
-        '.js': 'javascript',
-        '.jsx': 'jsx',
-        '.ts': 'typescript',
-        '.tsx': 'tsx',
-        '.html': 'html',
-        '.css': 'css',
-        '.scss': 'scss',
-        '.sass': 'sass',
-        '.less': 'less',
-        '.vue': 'vue',
-        
-        # Backend
-        '.py': 'python',
-        '.rb': 'ruby',
-        '.php': 'php',
-        '.java': 'java',
-        '.go': 'go',
-        '.rs': 'rust',
-        '.c': 'c',
-        '.cpp': 'cpp',
-        '.cs': 'csharp',
-        '.swift': 'swift',
-        '.kt': 'kotlin',
-        
-        # Data & Config
-        '.json': 'json',
-        '.yaml': 'yaml',
-        '.yml': 'yaml',
-        '.toml': 'toml',
-        '.xml': 'xml',
-        '.sql': 'sql',
-        '.graphql': 'graphql',
-        
-        # Shell & Scripts
-        '.sh': 'bash',
-        '.bash': 'bash',
-        '.zsh': 'zsh',
-        '.fish': 'fish',
-        '.ps1': 'powershell',
-        
-        # Documentation
-        '.md': 'markdown',
-        '.mdx': 'mdx',
-        '.rst': 'rst',
-        '.txt': 'text',
-        
-        # Other
-        '.r': 'r',
-        '.lua': 'lua',
-        '.dart': 'dart',
-        '.elm': 'elm',
-    }
-    
-    DEFAULT_CONFIG = {
-        'output_dir': None,  # Will be set to temp dir by tools
-        'blacklisted_paths': [],
-        'whitelisted_paths': [],
-        'extension_lang_map': DEFAULT_EXTENSION_MAP.copy(),
-        'hide_env': True  # Hide sensitive values from .env files by default
-    }
-    
     config_path = os.path.join(project_root, CONFIG_FILENAME)
     
     if not os.path.exists(config_path):
-        return DEFAULT_CONFIG
+        return _default_config()
     
-    from ai_tools.utils.logger import log_info, log_error
+    from ai_tools.utils.logger import log_info
     log_info(f"Znaleziono plik konfiguracyjny: {config_path}")
     
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            user_config = yaml.safe_load(f) or {}
-    except (yaml.YAMLError, IOError) as e:
-        log_error(f"Nie można odczytać lub przetworzyć pliku '{config_path}': {e}")
+    user_config = _read_user_config(config_path)
     
-    final_config = DEFAULT_CONFIG.copy()
+    final_config = _default_config()
     
     # Merge extension_lang_map specially - user config extends defaults
     if 'extension_lang_map' in user_config and user_config['extension_lang_map']:
-        final_config['extension_lang_map'] = DEFAULT_EXTENSION_MAP.copy()
         final_config['extension_lang_map'].update(user_config['extension_lang_map'])
     
     # Update other config values
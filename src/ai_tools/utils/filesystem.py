@@ -5,26 +5,109 @@ Functions for reading, formatting, and handling files.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from ai_tools.utils.logger import log_warning
-from ai_tools.utils.security import hide_env_values
+from ai_tools.utils.security import get_env_values_from_project, hide_env_values
 
 
-def format_file_content(file_path, project_root, extension_map, hide_env=True):
+# Reading files is I/O-bound, so threads overlap well despite the GIL
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Flags for files written through a raw descriptor (O_BINARY only exists on Windows)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def count_lines(content):
     """
-    Format file content for output with markdown code blocks.
+    Count lines of text the way editors do.
     
-    Optionally hides sensitive values from .env files.
+    Uses str.count() (a C-level scan) instead of iterating over lines;
+    a trailing newline does not start an extra line.
+    
+    Args:
+        content: File content as a string
+        
+    Returns:
+        Number of lines (0 for empty content)
+    """
+    if not content:
+        return 0
+    return content.count('\n') + (0 if content.endswith('\n') else 1)
+
+
+def read_text_file(file_path):
+    """
+    Read a whole file as UTF-8 text in a single unbuffered read.
+    
+    The raw file object sizes its read from fstat(), so the file is read
+    in one go instead of in 8 KiB buffer chunks, and decoded once.
+    Undecodable bytes are dropped and line endings are normalized to
+    '\\n', matching text-mode open() with errors='ignore'.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        File content as a string
+    """
+    with open(file_path, 'rb', buffering=0) as f:
+        data = f.read()
+    # Newlines are normalized on the raw bytes: a memchr-backed scan over
+    # one byte per character, before decoding may widen the string
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return data.decode('utf-8', errors='ignore')
+
+
+def write_text_file(file_path, content):
+    """
+    Write text to a file as UTF-8 through a raw file descriptor.
+    
+    Skips constructing TextIOWrapper/BufferedWriter objects for each file,
+    which dominates the cost of writing many small files. Newlines are
+    written as-is. New files get mode 0o666 minus the umask, like open().
+    
+    Args:
+        file_path: Path to the file (created or truncated)
+        content: Text to write
+    """
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(file_path, _WRITE_FLAGS, 0o666)
+    try:
+        written = 0
+        while written < len(data):
+            written += os.write(fd, data[written:])
+    finally:
+        os.close(fd)
+
+
+def read_and_format_file(file_path, project_root, extension_map, hide_env=True, env_values=None):
+    """
+    Read a file once and format it for output with markdown code blocks.
+    
+    Returns the raw content alongside the formatted block, so callers can
+    compute statistics (lines, tokens) without opening the file again.
     
     Args:
         file_path: Absolute path to the file
         project_root: Root directory of the project
         extension_map: Dictionary mapping file extensions to language names
         hide_env: Whether to hide environment variable values (default: True)
+        env_values: Values from get_env_values_from_project(); read if None
         
     Returns:
-        Formatted string with file header and content in markdown code block
+        Tuple (formatted_string, raw_content); raw_content is None if the
+        file could not be read
     """
-    rel_path = os.path.relpath(file_path, project_root).replace(os.path.sep, '/')
+    # Files are normally inside project_root, so slicing off the prefix
+    # replaces the much heavier os.path.relpath
+    project_prefix = os.path.join(project_root, '')
+    if file_path.startswith(project_prefix):
+        rel_path = file_path[len(project_prefix):]
+    else:
+        rel_path = os.path.relpath(file_path, project_root)
+    if os.path.sep != '/':
+        rel_path = rel_path.replace(os.path.sep, '/')
     file_ext = os.path.splitext(rel_path)[1]
     lang = extension_map.get(file_ext, '')
     
@@ -32,15 +115,16 @@ def format_file_content(file_path, project_root, extension_map, hide_env=True):
     code_block_start = f"```{lang}\n"
     code_block_end = "\n```"
     
-    content = ""
+    raw_content = None
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        raw_content = read_text_file(file_path)
+        content = raw_content
         
         # Hide sensitive values if enabled
         if hide_env:
-            content = hide_env_values(content, project_root, hide_enabled=True)
-            
+            content = hide_env_values(content, project_root, hide_enabled=True,
+                                      sensitive_values=env_values)
+    
     except FileNotFoundError:
         log_warning(f"Plik '{rel_path}' nie został znaleziony. Zostanie oznaczony w dumpie.")
         content = "[BŁĄD: Plik nie został znaleziony na dysku.]"
@@ -48,5 +132,50 @@ def format_file_content(file_path, project_root, extension_map, hide_env=True):
         log_warning(f"Nie można odczytać pliku '{rel_path}'. Powód: {e}")
         content = f"[BŁĄD: Nie można odczytać pliku. Powód: {e}]"
     
-    return f"{header}{code_block_start}{content}{code_block_end}"
+    return f"{header}{code_block_start}{content}{code_block_end}", raw_content
 
+
+def format_file_content(file_path, project_root, extension_map, hide_env=True):
+    """
+    Format file content for output with markdown code blocks.
+    
+    Optionally hides sensitive values from .env files.
+    
+    Args:
+        file_path: Absolute path to the file
+        project_root: Root directory of the project
+        extension_map: Dictionary mapping file extensions to language names
+        hide_env: Whether to hide environment variable values (default: True)
+        
+    Returns:
+        Formatted string with file header and content in markdown code block
+    """
+    return read_and_format_file(file_path, project_root, extension_map, hide_env=hide_env)[0]
+
+
+def format_files(file_paths, project_root, extension_map, hide_env=True):
+    """
+    Read and format many files concurrently with a thread pool.
+    
+    Args:
+        file_paths: List of absolute file paths
+        project_root: Root directory of the project
+        extension_map: Dictionary mapping file extensions to language names
+        hide_env: Whether to hide environment variable values (default: True)
+        
+    Returns:
+        List of (formatted_string, raw_content) tuples in the same order as
+        file_paths, as returned by read_and_format_file()
+    """
+    # .env files are read once per run, not once per dumped file
+    env_values = get_env_values_from_project(project_root) if hide_env else None
+    
+    with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+        results = list(executor.map(
+            lambda path: read_and_format_file(
+                path, project_root, extension_map, hide_env=hide_env, env_values=env_values
+            ),
+            file_paths
+        ))
+    
+    return results
@@ -6,9 +6,14 @@ Functions for hiding sensitive data from dumps (API keys, passwords, etc.)
 
 import os
 import re
+from functools import lru_cache
 from typing import Set, Optional
 
 
+# Keys that look like environment variables (uppercase with underscores)
+ENV_KEY_PATTERN = re.compile(r'^[A-Z_][A-Z0-9_]*$')
+
+
 def parse_env_file(env_file_path: str) -> Set[str]:
     """
     Parse .env file and extract all VALUES (not keys).
@@ -25,14 +30,14 @@ def parse_env_file(env_file_path: str) -> Set[str]:
     Returns:
         Set of values found in .env file
     """
-    if not os.path.exists(env_file_path):
-        return set()
-    
     values = set()
     
     try:
+        # Single read + split; text mode already turns \r\n and \r into \n,
+        # and unlike splitlines() this keeps \x0c, \u2028 etc. inside values.
+        # A missing file surfaces as IOError below
         with open(env_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            lines = f.read().split('\n')
         
         for line in lines:
             # Skip comments and empty lines
@@ -53,7 +58,7 @@ def parse_env_file(env_file_path: str) -> Set[str]:
             value = value.strip()
             
             # Skip if key doesn't look like an env var (uppercase with underscores)
-            if not re.match(r'^[A-Z_][A-Z0-9_]*$', key):
+            if not ENV_KEY_PATTERN.match(key):
                 continue
             
             # Remove quotes if present
@@ -93,12 +98,32 @@ def mask_sensitive_values(content: str, sensitive_values: Set[str]) -> str:
     if not sensitive_values or not content:
         return content
     
-    # Sort by length (longest first) to avoid partial replacements
-    sorted_values = sorted(sensitive_values, key=len, reverse=True)
-    
     masked_content = content
+    # For ASCII text IGNORECASE is plain lower(), so a substring check on the
+    # lowered content rules a value out without running its regex
+    lowered_content = content.lower() if content.isascii() else None
     
-    for value in sorted_values:
+    for lowered_value, pattern in _compile_mask_patterns(frozenset(sensitive_values)):
+        if lowered_content is not None and lowered_value is not None and lowered_value not in lowered_content:
+            continue
+        
+        masked_content, replaced = pattern.subn('[HIDDEN_ENV_VALUE]', masked_content)
+        if replaced and lowered_content is not None:
+            lowered_content = masked_content.lower()
+    
+    return masked_content
+
+
+@lru_cache(maxsize=8)
+def _compile_mask_patterns(sensitive_values):
+    """
+    Compile the masking regex for each sensitive value once per value set.
+    
+    Returns (lowercase value or None if not ASCII, pattern) pairs, longest
+    value first to avoid partial replacements.
+    """
+    compiled = []
+    for value in sorted(sensitive_values, key=len, reverse=True):
         # Skip very short values to avoid false positives
         if len(value) < 3:
             continue
@@ -106,7 +131,6 @@ def mask_sensitive_values(content: str, sensitive_values: Set[str]) -> str:
         # Escape special regex characters in the value
         escaped_value = re.escape(value)
         
-        # Replace the value with masked message
         # Match whole word or value in quotes/strings
         pattern = re.compile(
             rf'\b{escaped_value}\b|'        # Whole word
@@ -114,10 +138,9 @@ def mask_sensitive_values(content: str, sensitive_values: Set[str]) -> str:
             rf"'{escaped_value}'",          # In single quotes
             re.IGNORECASE
         )
-        
-        masked_content = pattern.sub('[HIDDEN_ENV_VALUE]', masked_content)
+        compiled.append((value.lower() if value.isascii() else None, pattern))
     
-    return masked_content
+    return compiled
 
 
 def get_env_values_from_project(project_root: str) -> Set[str]:
@@ -146,7 +169,8 @@ def get_env_values_from_project(project_root: str) -> Set[str]:
     return all_values
 
 
-def hide_env_values(content: str, project_root: str, hide_enabled: bool = True) -> str:
+def hide_env_values(content: str, project_root: str, hide_enabled: bool = True,
+                    sensitive_values: Optional[Set[str]] = None) -> str:
     """
     Hide environment variable values in content if enabled.
     
@@ -156,6 +180,8 @@ def hide_env_values(content: str, project_root: str, hide_enabled: bool = True)
         content: Text content to process
         project_root: Root directory of the project (to find .env)
         hide_enabled: Whether to hide values (default: True)
+        sensitive_values: Values from get_env_values_from_project(), when
+            the caller already has them (avoids re-reading .env files)
         
     Returns:
         Content with sensitive values masked (if enabled)
@@ -163,7 +189,8 @@ def hide_env_values(content: str, project_root: str, hide_enabled: bool = True)
     if not hide_enabled:
         return content
     
-    sensitive_values = get_env_values_from_project(project_root)
+    if sensitive_values is None:
+        sensitive_values = get_env_values_from_project(project_root)
     
     if not sensitive_values:
         return content
@@ -15,6 +15,16 @@ import re
 from ai_tools.utils.logger import log_warning
 
 
+# Write buffer for dump files; large dumps need far fewer write() calls
+DUMP_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# File header in a dump ("---\nFile: path\n---")
+DUMP_HEADER_PATTERN = re.compile(r'^---\s*\nFile:\s*([^\n]+)\s*\n---\s*$', re.MULTILINE)
+
+# Code block holding a file's content; greedy `(.*)` handles nested ``` inside the file
+DUMP_CODE_BLOCK_PATTERN = re.compile(r'^\s*```[^\n]*\n(.*)\n```\s*$', re.DOTALL)
+
+
 def get_project_hash(project_root: str) -> str:
     """
     Generate a short hash for project identification.
@@ -135,6 +145,32 @@ def list_recent_dumps(dump_dir: str, limit: int = 20) -> List[Tuple[str, str, in
     return [(name, ts, size) for name, ts, size, _ in files_info[:limit]]
 
 
+def write_dump_file(output_path: str, parts: List[str], separator: str = "\n\n") -> str:
+    """
+    Write formatted parts to a dump file and return the full dump text.
+    
+    The text is joined once (the clipboard needs it anyway) and written in
+    1 MiB slices, so at most one slice is encoded at a time instead of a
+    second full copy of the dump.
+    
+    Args:
+        output_path: Path of the dump file to create
+        parts: Formatted file blocks in output order
+        separator: Separator placed between parts
+        
+    Returns:
+        Complete dump text
+        
+    Raises:
+        IOError: If the file cannot be written
+    """
+    dump_text = separator.join(parts)
+    with open(output_path, 'w', encoding='utf-8', buffering=DUMP_WRITE_BUFFER_SIZE) as outfile:
+        for start in range(0, len(dump_text), DUMP_WRITE_BUFFER_SIZE):
+            outfile.write(dump_text[start:start + DUMP_WRITE_BUFFER_SIZE])
+    return dump_text
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -167,8 +203,7 @@ def parse_dump_file(dump_path: str) -> List[Tuple[str, str]]:
         return []
 
     # 1. Znajdź wszystkie nagłówki plików w całym dumpie
-    header_pattern = re.compile(r'^---\s*\nFile:\s*([^\n]+)\s*\n---\s*$', re.MULTILINE)
-    matches = list(header_pattern.finditer(content))
+    matches = list(DUMP_HEADER_PATTERN.finditer(content))
     
     results = []
     # 2. Iteruj po każdym znalezionym pliku
@@ -189,7 +224,7 @@ def parse_dump_file(dump_path: str) -> List[Tuple[str, str]]:
         
         # 4. Z tego bloku wyciągnij treść z wewnątrz bloku kodu markdown
         # Używamy chciwego `(.*)` i `re.DOTALL`, aby poprawnie obsłużyć zagnieżdżone ` ``` `
-        code_match = re.search(r'^\s*```[^\n]*\n(.*)\n```\s*$', content_block, re.DOTALL)
+        code_match = DUMP_CODE_BLOCK_PATTERN.match(content_block)
         
         if code_match:
             file_content = code_match.group(1)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from ai_tools.utils import config
+
+
+class TestGetConfig(unittest.TestCase):
+    """Testy wczytywania konfiguracji."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
+        self.config_path = os.path.join(self.test_dir, config.CONFIG_FILENAME)
+
+    def _write_config(self, content):
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_defaults_without_config_file(self):
+        """Test że bez pliku zwracane są wartości domyślne."""
+        result = config.get_config(self.test_dir)
+        self.assertEqual(result['blacklisted_paths'], [])
+        self.assertTrue(result['hide_env'])
+        self.assertEqual(result['extension_lang_map']['.py'], 'python')
+
+    def test_user_extension_map_extends_defaults(self):
+        """Test że extension_lang_map użytkownika rozszerza domyślne mapowanie."""
+        self._write_config("extension_lang_map:\n  .custom: customlang\n")
+        result = config.get_config(self.test_dir)
+        self.assertEqual(result['extension_lang_map']['.custom'], 'customlang')
+        self.assertEqual(result['extension_lang_map']['.py'], 'python')
+
+    def test_returned_config_is_independent_copy(self):
+        """Test że modyfikacja zwróconego słownika nie wpływa na kolejne wywołania."""
+        self._write_config("blacklisted_paths:\n  - dist/\n")
+        first = config.get_config(self.test_dir)
+        first['blacklisted_paths'].append('mutated/')
+        second = config.get_config(self.test_dir)
+        self.assertEqual(second['blacklisted_paths'], ['dist/'])
+
+    def test_edited_config_is_reloaded(self):
+        """Test że zmiana pliku konfiguracyjnego jest widoczna przy kolejnym wczytaniu."""
+        self._write_config("hide_env: true\n")
+        self.assertTrue(config.get_config(self.test_dir)['hide_env'])
+        self._write_config("hide_env: false\nblacklisted_paths: []\n")
+        self.assertFalse(config.get_config(self.test_dir)['hide_env'])
+
+    def test_config_created_later_is_found(self):
+        """Test że plik konfiguracyjny utworzony później w tym samym procesie jest wykrywany."""
+        subdir = os.path.join(self.test_dir, "src")
+        os.makedirs(subdir)
+        self.assertEqual(config.find_project_root(subdir), os.path.abspath(subdir))
+        self._write_config("hide_env: true\n")
+        self.assertEqual(config.find_project_root(subdir), os.path.abspath(self.test_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
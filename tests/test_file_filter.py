@@ -0,0 +1,213 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from ai_tools.core.file_filter import (
+    compile_patterns,
+    filter_files_by_rules,
+    find_compiled_match,
+    find_most_specific_match,
+    get_text_extensions,
+    is_path_match,
+    looks_binary,
+    make_directory_pruner,
+    validate_config_paths,
+)
+
+
+class TestFindMostSpecificMatch(unittest.TestCase):
+    """Testy dopasowywania wzorców blacklist/whitelist."""
+
+    def test_no_patterns(self):
+        """Test dla pustej listy wzorców."""
+        self.assertEqual(find_most_specific_match("src/main.py", []), (None, 0))
+
+    def test_directory_pattern_with_and_without_slash(self):
+        """Test że katalog z ukośnikiem i bez pasuje tak samo."""
+        self.assertEqual(find_most_specific_match("build/out.js", ["build/"]), ("build", 1))
+        self.assertEqual(find_most_specific_match("build/out.js", ["build"]), ("build", 1))
+        self.assertEqual(find_most_specific_match("build", ["build/"]), ("build", 1))
+
+    def test_directory_pattern_is_not_a_plain_prefix(self):
+        """Test że 'build' nie pasuje do 'builder/x.js'."""
+        self.assertEqual(find_most_specific_match("builder/x.js", ["build"]), (None, 0))
+
+    def test_wildcard_matches_across_directories(self):
+        """Test że '*' w wildcard pasuje też do '/' (semantyka fnmatch)."""
+        self.assertEqual(find_most_specific_match("logs/debug.log", ["*.log"]), ("*.log", 0.5))
+
+    def test_most_specific_pattern_wins(self):
+        """Test że wygrywa najbardziej specyficzny wzorzec, niezależnie od kolejności."""
+        patterns = ["vendor/", "*.js", "vendor/libs/"]
+        self.assertEqual(find_most_specific_match("vendor/libs/a.js", patterns), ("vendor/libs", 2))
+        self.assertEqual(find_most_specific_match("vendor/other/a.js", patterns), ("vendor", 1))
+        self.assertEqual(find_most_specific_match("src/a.js", patterns), ("*.js", 0.5))
+
+    def test_deeper_directory_beats_shallower_wildcard(self):
+        """Test że głębszy katalog wygrywa z płytszym wildcardem."""
+        patterns = ["docs/*.md", "docs/api/"]
+        self.assertEqual(find_most_specific_match("docs/api/index.md", patterns), ("docs/api", 2))
+
+    def test_deepest_directory_wins_among_many(self):
+        """Test że z wielu katalogów wygrywa najgłębszy przodek ścieżki."""
+        patterns = [f"pkg{i}/" for i in range(100)] + ["src", "src/app/", "src/app/core", "*.py"]
+        self.assertEqual(find_most_specific_match("src/app/core/x.py", patterns), ("src/app/core", 3))
+        self.assertEqual(find_most_specific_match("src/app/util.py", patterns), ("src/app", 2))
+        self.assertEqual(find_most_specific_match("src/application/x.py", patterns), ("src", 1))
+        self.assertEqual(find_most_specific_match("other/x.py", patterns), ("*.py", 0.5))
+
+    def test_wildcards_skipped_when_directory_match_cannot_be_beaten(self):
+        """Test że regex wildcardów nie jest sprawdzany, gdy katalog jest bardziej specyficzny."""
+        compiled = compile_patterns(["vendor/", "*.js"])._replace(regex=MagicMock())
+        self.assertEqual(find_compiled_match("vendor/a.js", compiled), ("vendor", 1))
+        compiled.regex.match.assert_not_called()
+
+    def test_compiled_patterns_reusable(self):
+        """Test że skompilowane wzorce dają te same wyniki co lista wzorców."""
+        patterns = [".venv/", "*.lock", "src/legacy"]
+        compiled = compile_patterns(patterns)
+        for path in ["yarn.lock", ".venv/lib/a.py", "src/legacy/x.py", "src/main.py"]:
+            self.assertEqual(
+                find_compiled_match(path, compiled),
+                find_most_specific_match(path, patterns)
+            )
+
+
+class TestIsPathMatch(unittest.TestCase):
+    """Testy prostego dopasowania ścieżki do listy wzorców."""
+
+    def test_directory_and_wildcard_patterns(self):
+        """Test katalogów (z/bez ukośnika) i wildcardów."""
+        patterns = ["build/", "dist", "*.lock"]
+        self.assertTrue(is_path_match("build/out.js", patterns))
+        self.assertTrue(is_path_match("dist", patterns))
+        self.assertTrue(is_path_match("sub/yarn.lock", patterns))
+        self.assertFalse(is_path_match("builder/x.js", patterns))
+
+    def test_repeated_calls_with_new_list_object(self):
+        """Test że przygotowane wzorce zależą od zawartości listy, nie od obiektu."""
+        self.assertTrue(is_path_match("a/x.py", ["a/"]))
+        self.assertFalse(is_path_match("a/x.py", ["b/"]))
+
+
+class TestMakeDirectoryPruner(unittest.TestCase):
+    """Testy pomijania całych katalogów podczas skanowania."""
+
+    def test_blacklisted_directory_is_pruned(self):
+        """Test że katalog z blacklist (i jego podkatalogi) jest pomijany."""
+        should_prune = make_directory_pruner([], ["node_modules", ".git/"])
+        self.assertTrue(should_prune("node_modules"))
+        self.assertTrue(should_prune("node_modules/pkg"))
+        self.assertTrue(should_prune(".git"))
+        self.assertFalse(should_prune("src"))
+
+    def test_wildcard_blacklist_does_not_prune(self):
+        """Test że wildcard na blacklist nie powoduje pominięcia katalogu."""
+        self.assertFalse(make_directory_pruner([], ["*.egg-info"])("pkg.egg-info"))
+
+    def test_directory_with_whitelisted_child_is_kept(self):
+        """Test że katalog zawierający ścieżkę z whitelist nie jest pomijany."""
+        should_prune = make_directory_pruner(["vendor/libs/"], ["vendor/"])
+        self.assertFalse(should_prune("vendor"))
+        self.assertFalse(should_prune("vendor/libs"))
+        self.assertTrue(should_prune("vendor/other"))
+
+    def test_more_specific_whitelisted_ancestor_keeps_directory(self):
+        """Test że bardziej specyficzny przodek z whitelist blokuje pomijanie."""
+        should_prune = make_directory_pruner(["build/config/"], ["build"])
+        self.assertFalse(should_prune("build/config/sub"))
+
+    def test_more_specific_whitelist_wildcard_keeps_directory(self):
+        """Test że bardziej specyficzny wildcard z whitelist blokuje pomijanie."""
+        self.assertFalse(make_directory_pruner(["vendor/*.js"], ["vendor/"])("vendor"))
+        self.assertTrue(make_directory_pruner(["*.js"], ["vendor/"])("vendor"))
+
+    def test_gitignored_directory_is_pruned_without_whitelist(self):
+        """Test że katalog ignorowany przez git jest pomijany, jeśli whitelist go nie dotyczy."""
+        self.assertTrue(make_directory_pruner([], [], {"node_modules"})("node_modules"))
+        self.assertFalse(make_directory_pruner(["node_modules/pkg/"], [], {"node_modules"})("node_modules"))
+        self.assertFalse(make_directory_pruner(["*.js"], [], {"node_modules"})("node_modules"))
+
+
+class TestValidateConfigPaths(unittest.TestCase):
+    """Testy wykrywania konfliktów między whitelist i blacklist."""
+
+    def test_no_conflicts(self):
+        """Test że poprawna konfiguracja zwraca pustą listę."""
+        config = {'whitelisted_paths': ["vendor/libs/"], 'blacklisted_paths': ["vendor/"]}
+        self.assertEqual(validate_config_paths(config), [])
+
+    def test_conflicts_are_normalized_and_sorted(self):
+        """Test że konflikty są wykrywane po normalizacji i zwracane posortowane."""
+        config = {'whitelisted_paths': ["src/", "docs", "*.md"], 'blacklisted_paths': ["src", "docs/"]}
+        self.assertEqual(validate_config_paths(config), ["docs", "src"])
+
+
+class TestFilterFilesByRules(unittest.TestCase):
+    """Testy filtrowania listy plików według reguł z konfiguracji."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
+        for rel_path in ["out/dump.txt", "outsider/keep.py", "src/app.py", "vendor/lib.js"]:
+            os.makedirs(os.path.join(self.test_dir, os.path.dirname(rel_path)), exist_ok=True)
+            with open(os.path.join(self.test_dir, rel_path), 'w') as f:
+                f.write("content")
+
+    def _filter(self, **config):
+        files = ["out/dump.txt", "outsider/keep.py", "src/app.py", "vendor/lib.js"]
+        result = filter_files_by_rules(files, self.test_dir, config)
+        return sorted(os.path.relpath(p, self.test_dir) for p in result)
+
+    def test_output_dir_does_not_match_sibling_prefix(self):
+        """Test że output_dir 'out' nie wyklucza katalogu 'outsider'."""
+        self.assertEqual(
+            self._filter(output_dir="out", blacklisted_paths=["vendor/"]),
+            ["outsider/keep.py", "src/app.py"]
+        )
+
+    def test_output_dir_is_optional(self):
+        """Test że brak output_dir (dumpy w katalogu temp) nie powoduje błędu."""
+        self.assertEqual(len(self._filter(output_dir=None)), 4)
+
+
+class TestLooksBinary(unittest.TestCase):
+    """Testy szybkiego wykrywania plików binarnych."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
+        self.text_extensions = get_text_extensions({'extension_lang_map': {'.Custom': 'custom'}})
+
+    def _write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_known_text_extension_is_not_probed(self):
+        """Test że plik ze znanym rozszerzeniem tekstowym nie jest czytany."""
+        path = self._write("data.py", b"\0\0")
+        self.assertFalse(looks_binary(path, self.text_extensions))
+
+    def test_config_extensions_are_case_insensitive(self):
+        """Test że rozszerzenia z extension_lang_map są porównywane bez wielkości liter."""
+        path = self._write("file.CUSTOM", b"\0")
+        self.assertFalse(looks_binary(path, self.text_extensions))
+
+    def test_unknown_extension_is_probed(self):
+        """Test że plik o nieznanym rozszerzeniu jest sprawdzany na bajty NUL."""
+        self.assertTrue(looks_binary(self._write("image.png", b"\x89PNG\0"), self.text_extensions))
+        self.assertFalse(looks_binary(self._write("notes.unknown", b"text"), self.text_extensions))
+
+    def test_missing_file_is_skipped(self):
+        """Test że usunięty plik jest traktowany jak binarny (pomijany)."""
+        missing = os.path.join(self.test_dir, "deleted.py")
+        self.assertTrue(looks_binary(missing, self.text_extensions))
+
+
+if __name__ == '__main__':
+    unittest.main()
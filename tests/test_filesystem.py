@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ai_tools.utils import security
+from ai_tools.utils.filesystem import count_lines, format_files, read_text_file, write_text_file
+
+
+class TestCountLines(unittest.TestCase):
+    """Testy liczenia linii w treści pliku."""
+
+    def test_empty_content(self):
+        """Test że pusty plik ma 0 linii."""
+        self.assertEqual(count_lines(""), 0)
+
+    def test_without_trailing_newline(self):
+        """Test że ostatnia linia bez znaku nowej linii jest liczona."""
+        self.assertEqual(count_lines("a"), 1)
+        self.assertEqual(count_lines("a\nb"), 2)
+
+    def test_trailing_newline_is_not_an_extra_line(self):
+        """Test że końcowy znak nowej linii nie tworzy dodatkowej linii."""
+        self.assertEqual(count_lines("a\n"), 1)
+        self.assertEqual(count_lines("a\nb\n"), 2)
+
+
+class TestReadTextFile(unittest.TestCase):
+    """Testy odczytu plików tekstowych."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
+
+    def _write(self, data):
+        path = os.path.join(self.test_dir, "file.txt")
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_line_endings_are_normalized(self):
+        """Test że końce linii CRLF i CR są zamieniane na LF."""
+        self.assertEqual(read_text_file(self._write(b"a\r\nb\rc\n")), "a\nb\nc\n")
+
+    def test_invalid_utf8_is_ignored(self):
+        """Test że niepoprawne bajty UTF-8 są pomijane."""
+        self.assertEqual(read_text_file(self._write("zażółć".encode('utf-8') + b"\xff!")), "zażółć!")
+
+    def test_write_text_file_round_trip(self):
+        """Test że zapis przez deskryptor nadpisuje plik i zachowuje UTF-8."""
+        path = self._write(b"old content that is longer")
+        write_text_file(path, "zażółć\n")
+        self.assertEqual(read_text_file(path), "zażółć\n")
+
+
+class TestFormatFiles(unittest.TestCase):
+    """Testy formatowania wielu plików naraz."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.project_dir = tmp.name
+
+    def test_env_files_read_once_per_run(self):
+        """Test że pliki .env są czytane raz na uruchomienie, a nie dla każdego pliku."""
+        paths = []
+        for i in range(5):
+            paths.append(os.path.join(self.project_dir, f"m{i}.py"))
+            with open(paths[-1], 'w') as f:
+                f.write("token = 'secret123'\n")
+        with open(os.path.join(self.project_dir, ".env"), 'w') as f:
+            f.write("API_KEY=secret123\n")
+
+        with patch('ai_tools.utils.security.parse_env_file', wraps=security.parse_env_file) as parse:
+            results = format_files(paths, self.project_dir, {'.py': 'python'})
+
+        self.assertEqual(parse.call_count, 4)  # .env, .env.local, .env.development, .env.production
+        self.assertTrue(all("[HIDDEN_ENV_VALUE]" in formatted for formatted, _ in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
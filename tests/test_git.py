@@ -2,9 +2,8 @@ import os
 import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
-import logging
-from io import StringIO
 from unittest.mock import patch, MagicMock
 
 from ai_tools.cli import dump_git as git
@@ -12,55 +11,59 @@ from ai_tools.utils import helpers
 
 class TestDumpGit(unittest.TestCase):
 
-    def setUp(self):
-        self.test_dir = os.path.abspath("test_project_git")
-        os.makedirs(self.test_dir, exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        """Tworzy raz wzorcowe repozytorium Git z początkowym commitem, kopiowane do każdego testu."""
+        cls._template_tmp = tempfile.TemporaryDirectory()
+        cls.template_dir = cls._template_tmp.name
 
-        with open(os.path.join(self.test_dir, helpers.CONFIG_FILENAME), "w") as f:
-            f.write(f"output_dir: {os.path.join(self.test_dir, '.dump-outputs')}\n")
+        # Względny output_dir, żeby konfiguracja we wzorcu nie zależała od katalogu testu
+        with open(os.path.join(cls.template_dir, helpers.CONFIG_FILENAME), "w") as f:
+            f.write("output_dir: .dump-outputs\n")
+
+        subprocess.run(["git", "init"], cwd=cls.template_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-        subprocess.run(["git", "init"], cwd=self.test_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        subprocess.run(["git", "config", "user.name", "Test User"], cwd=self.test_dir)
-        subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=self.test_dir)
+        with open(os.path.join(cls.template_dir, "committed.txt"), "w") as f: f.write("initial content")
+        subprocess.run(["git", "add", "."], cwd=cls.template_dir)
+        # Tożsamość autora przez `-c` zamiast dwóch osobnych wywołań `git config`
+        subprocess.run(
+            ["git", "-c", "user.name=Test User", "-c", "user.email=test@example.com",
+             "commit", "-m", "initial commit"],
+            cwd=cls.template_dir, stdout=subprocess.DEVNULL
+        )
 
-        with open(os.path.join(self.test_dir, "committed.txt"), "w") as f: f.write("initial content")
-        subprocess.run(["git", "add", "."], cwd=self.test_dir)
-        subprocess.run(["git", "commit", "-m", "initial commit"], cwd=self.test_dir, stdout=subprocess.DEVNULL)
+    @classmethod
+    def tearDownClass(cls):
+        cls._template_tmp.cleanup()
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_project_git_")
+        self.test_dir = os.path.realpath(self._tmp.name)
+        shutil.copytree(self.template_dir, self.test_dir, dirs_exist_ok=True)
 
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
 
-        # --- POPRAWKA: Konfiguracja przechwytywania logów ---
-        self.log_stream = StringIO()
-        self.logger = logging.getLogger('ai_tools')
-        self.stream_handler = logging.StreamHandler(self.log_stream)
-        self.stream_handler.setLevel(logging.INFO)
-        self.logger.addHandler(self.stream_handler)
-        self.logger.setLevel(logging.INFO)
-
 
     def tearDown(self):
-        # --- POPRAWKA: Usunięcie przechwytywarki logów ---
-        self.logger.removeHandler(self.stream_handler)
-
         os.chdir(self.original_cwd)
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
 
     @patch('ai_tools.cli.dump_git.pyperclip', MagicMock())
     def test_dump_git_staged(self):
         with open("staged.txt", "w") as f: f.write("staged content")
         subprocess.run(["git", "add", "staged.txt"], cwd=self.test_dir)
 
-        with patch.object(sys, 'argv', ['dump-git', '--staged']):
-            git.main()
+        with self.assertLogs('ai_tools', level='INFO') as log_cm:
+            with patch.object(sys, 'argv', ['dump-git', '--staged']):
+                git.main()
 
         output = git.pyperclip.copy.call_args[0][0]
         self.assertIn("File: staged.txt", output)
         self.assertNotIn("File: committed.txt", output)
         
-        # --- POPRAWKA: Sprawdzanie przechwyconych logów ---
-        self.assertIn("Znaleziono 1 zmienionych plików do przetworzenia (łącznie 1 linii kodu)", self.log_stream.getvalue())
+        logs = "\n".join(record.getMessage() for record in log_cm.records)
+        self.assertIn("Znaleziono 1 zmienionych plików do przetworzenia (łącznie 1 linii kodu)", logs)
 
 
     @patch('ai_tools.cli.dump_git.pyperclip', MagicMock())
@@ -90,6 +93,25 @@ class TestDumpGit(unittest.TestCase):
         self.assertIn("File: untracked.txt", output)
         self.assertIn("File: committed.txt", output)
 
+    def test_collect_changes_classifies_status_columns(self):
+        """Testuje klasyfikację staged/unstaged/untracked z jednego `git status`."""
+        with open("staged.txt", "w") as f: f.write("staged")
+        subprocess.run(["git", "add", "staged.txt"], cwd=self.test_dir)
+        with open("staged.txt", "a") as f: f.write("\nmodified after add")
+        with open("committed.txt", "a") as f: f.write("\nunstaged")
+        os.makedirs("new_dir", exist_ok=True)
+        with open("new_dir/untracked.txt", "w") as f: f.write("untracked")
+
+        self.assertEqual(git.collect_changes(self.test_dir, 'staged'), {"staged.txt"})
+        self.assertEqual(
+            git.collect_changes(self.test_dir, 'unstaged'),
+            {"staged.txt", "committed.txt", "new_dir/untracked.txt"}
+        )
+        self.assertEqual(
+            git.collect_changes(self.test_dir, 'all'),
+            {"staged.txt", "committed.txt", "new_dir/untracked.txt"}
+        )
+
     # NOWE TESTY DLA BLACKLIST/WHITELIST
     
     def _write_config(self, config_content):
@@ -229,13 +251,14 @@ whitelisted_paths:
         subprocess.run(["git", "add", "."], cwd=self.test_dir, stdout=subprocess.DEVNULL)
         
         # Oczekujemy SystemExit
-        with self.assertRaises(SystemExit) as cm:
-            with patch.object(sys, 'argv', ['dump-git', '--staged']):
-                git.main()
+        with self.assertLogs('ai_tools', level='INFO') as log_cm:
+            with self.assertRaises(SystemExit) as cm:
+                with patch.object(sys, 'argv', ['dump-git', '--staged']):
+                    git.main()
         
         self.assertEqual(cm.exception.code, 1)
         
-        logs = self.log_stream.getvalue()
+        logs = "\n".join(record.getMessage() for record in log_cm.records)
         self.assertTrue('nieprawidłow' in logs.lower() or 'błąd' in logs.lower())
 
 if __name__ == '__main__':
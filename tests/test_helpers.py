@@ -2,7 +2,6 @@ import os
 import sys
 import unittest
 from unittest.mock import patch
-from io import StringIO
 
 from ai_tools.utils.helpers import _extract_path_from_text, _find_blocks_with_regex, parse_patch_content
 
@@ -22,7 +21,7 @@ class TestExtractPathFromText(unittest.TestCase):
 
     def test_relative_path_with_double_dot(self):
         """Test dla ścieżki względnej z ../ - powinna być odrzucona ze względów bezpieczeństwa."""
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             result = _extract_path_from_text("../data/input.csv")
         self.assertIsNone(result)
 
@@ -58,7 +57,7 @@ class TestExtractPathFromText(unittest.TestCase):
 
     def test_multiple_paths_with_different_formats(self):
         """Test dla wielu ścieżek w różnych formatach (path traversal odrzucane)."""
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             result = _extract_path_from_text("Tutaj przykłady: ./src/main.py  ../data/input.csv")
         # ../data/input.csv jest odrzucane, więc zwraca ./src/main.py
         self.assertEqual(result, "./src/main.py")
@@ -115,20 +114,32 @@ class TestExtractPathFromText(unittest.TestCase):
 
     def test_path_traversal_is_rejected(self):
         """Test że ścieżki z path traversal (..) są odrzucane."""
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             result = _extract_path_from_text("../evil.txt")
         self.assertIsNone(result)
 
     def test_path_traversal_in_middle_is_rejected(self):
         """Test że ścieżki z path traversal w środku są odrzucane."""
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             result = _extract_path_from_text("../config/settings.json")
         self.assertIsNone(result)
 
+    def test_path_traversal_after_valid_segment_is_rejected(self):
+        """Test że '..' w środku ścieżki wychodzące poza katalog jest odrzucane."""
+        with self.assertLogs('ai_tools', level='WARNING'):
+            result = _extract_path_from_text("src/../../etc/evil.txt")
+        self.assertIsNone(result)
+
+    def test_double_dot_inside_name_is_allowed(self):
+        """Test że nazwa pliku zaczynająca się od '..' nie jest traktowana jak path traversal."""
+        self.assertEqual(_extract_path_from_text("..hidden.txt"), "..hidden.txt")
+        self.assertEqual(_extract_path_from_text("src/../main.py"), "src/../main.py")
+
     def test_path_traversal_with_valid_paths(self):
         """Test że path traversal nie wpływa na inne ścieżki w tym samym tekście."""
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING') as logs:
             result = _extract_path_from_text("../evil.txt oraz src/main.py")
+        self.assertIn("../evil.txt", logs.output[0])
         # Powinien zwrócić src/main.py (ignorując ../evil.txt)
         self.assertEqual(result, "src/main.py")
 
@@ -205,11 +216,28 @@ second block
         text = """```python
 unclosed block
 """
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             blocks = _find_blocks_with_regex(text)
         # Nie powinien znaleźć żadnych bloków (niezamknięty)
         self.assertEqual(len(blocks), 0)
 
+    def test_unclosed_block_warning_reports_line_number(self):
+        """Test że ostrzeżenie o niezamkniętym bloku podaje numer linii otwarcia."""
+        text = "intro\n```python\nclosed\n```\n\n```js\nunclosed\n"
+        with self.assertLogs('ai_tools', level='WARNING') as logs:
+            _find_blocks_with_regex(text)
+        self.assertIn("otwarty w linii 6", logs.output[0])
+
+    def test_nested_unclosed_blocks_report_each_line_number(self):
+        """Test że każdy z zagnieżdżonych niezamkniętych bloków ma swój numer linii."""
+        text = "intro\n```python\nouter\n````js\ninner\n```x ```y\n"
+        with self.assertLogs('ai_tools', level='WARNING') as logs:
+            blocks = _find_blocks_with_regex(text)
+        self.assertEqual(blocks, [])
+        self.assertEqual(len(logs.output), 4)
+        for output, line_number in zip(logs.output, [2, 4, 6, 6]):
+            self.assertIn(f"otwarty w linii {line_number}", output)
+
     def test_block_with_tildes(self):
         """Test dla bloku z ~~~ zamiast ```."""
         text = """~~~python
@@ -273,7 +301,7 @@ code without trailing newline```"""
         text = """```python
 code
 ~~~"""
-        with patch('sys.stdout', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             blocks = _find_blocks_with_regex(text)
         # Nie powinien zamknąć bloku (różne typy znaczników)
         self.assertEqual(len(blocks), 0)
@@ -347,6 +375,17 @@ end"""
         self.assertEqual(content1, 'block1')
         self.assertEqual(content2, 'block2')
 
+    def test_short_backtick_runs_are_not_fences(self):
+        """Test że inline `kod` i ``kod`` w prozie nie są traktowane jak ogrodzenia."""
+        text = """Użyj `x` oraz ``y`` tutaj, ~~skreślone~~
+~~~python
+code
+~~~
+koniec"""
+        blocks = _find_blocks_with_regex(text)
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0][3], 'code')
+
 
 class TestParsePatchContent(unittest.TestCase):
     """Testy dla funkcji parsowania zawartości patchy."""
@@ -424,6 +463,13 @@ export default Button;
         patches = parse_patch_content("")
         self.assertEqual(patches, [])
 
+    def test_text_without_fences_skips_block_search(self):
+        """Test że tekst bez znaków ogrodzenia nie jest w ogóle skanowany."""
+        with patch('ai_tools.core.patch_ops._iter_blocks') as mock_iter:
+            patches = parse_patch_content("Zaktualizuj src/main.py, proszę.\n")
+        self.assertEqual(patches, [])
+        mock_iter.assert_not_called()
+
     def test_code_block_without_path(self):
         """Test dla bloku kodu bez ścieżki - powinien być pominięty."""
         content = """
@@ -433,7 +479,7 @@ print("orphan code")
 ```
 """
         # Powinien wyświetlić ostrzeżenie ale nie rzucić wyjątku
-        with patch('sys.stderr', new_callable=StringIO):
+        with self.assertLogs('ai_tools', level='WARNING'):
             patches = parse_patch_content(content)
         self.assertEqual(len(patches), 0)
 
@@ -449,6 +495,17 @@ content
         self.assertEqual(len(patches), 1)
         self.assertEqual(patches[0][0], "src/file.py")
 
+    def test_outer_code_block_with_language_is_unwrapped(self):
+        """Test że zewnętrzny blok z nazwą języka też jest rozpakowywany."""
+        content = """```markdown
+src/file.py
+```python
+content
+```
+```"""
+        patches = parse_patch_content(content)
+        self.assertEqual(patches, [("src/file.py", "content")])
+
     def test_path_normalization_backslashes(self):
         """Test normalizacji ścieżek z backslashami."""
         content = """
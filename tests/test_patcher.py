@@ -1,6 +1,7 @@
 import os
 import shutil
 import sys
+import tempfile
 import unittest
 from io import StringIO # <-- POPRAWKA: Dodano brakujący import
 from unittest.mock import patch, MagicMock
@@ -10,15 +11,15 @@ from ai_tools.cli import ai_patch as patcher
 class TestAiPatch(unittest.TestCase):
 
     def setUp(self):
-        self.test_dir = os.path.abspath("test_project_patcher")
-        os.makedirs(self.test_dir, exist_ok=True)
+        # Osobny katalog tymczasowy dla każdego testu (bez stałej ścieżki w cwd)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = os.path.realpath(self._tmp.name)
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
 
     def tearDown(self):
         os.chdir(self.original_cwd)
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
 
     @patch('ai_tools.cli.ai_patch.pyperclip')
     def test_patch_create_and_update(self, mock_pyperclip):
@@ -71,5 +72,23 @@ you have been hacked
         # Sprawdzenie, czy plik nie został utworzony poza katalogiem projektu
         self.assertFalse(os.path.exists(os.path.abspath(os.path.join(self.test_dir, "..", "evil.txt"))))
 
+    @patch('ai_tools.cli.ai_patch.pyperclip')
+    def test_patch_security_rejects_sibling_directory_with_same_prefix(self, mock_pyperclip):
+        # Ścieżka wychodzi do katalogu, którego nazwa zaczyna się od nazwy projektu.
+        # Parser odrzuca takie ścieżki sam, więc podajemy ją bezpośrednio,
+        # żeby sprawdzić zabezpieczenie przy zapisie
+        sibling_dir = self.test_dir + "_sibling"
+        mock_pyperclip.paste.return_value = "patch"
+        evil_patches = [(f"../{os.path.basename(sibling_dir)}/evil.txt", "you have been hacked")]
+        try:
+            with patch('sys.stderr', new_callable=StringIO), patch.object(sys, 'argv', ['ai-patch']), \
+                    patch('ai_tools.cli.ai_patch.parse_patch_content', return_value=evil_patches):
+                result = patcher.main()
+
+            self.assertEqual(result, 1)
+            self.assertFalse(os.path.exists(os.path.join(sibling_dir, "evil.txt")))
+        finally:
+            shutil.rmtree(sibling_dir, ignore_errors=True)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
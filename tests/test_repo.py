@@ -2,9 +2,9 @@ import os
 import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
 import logging
-from io import StringIO
 from unittest.mock import patch, MagicMock
 
 from ai_tools.cli import dump_repo as repo
@@ -12,65 +12,64 @@ from ai_tools.utils import helpers
 
 class TestDumpRepo(unittest.TestCase):
 
-    def setUp(self):
-        """Tworzy tymczasową strukturę katalogów i repozytorium Git do testów."""
-        self.test_dir = os.path.abspath("test_project_repo")
-        os.makedirs(os.path.join(self.test_dir, "src"), exist_ok=True)
-        os.makedirs(os.path.join(self.test_dir, ".venv/lib"), exist_ok=True)
-        os.makedirs(os.path.join(self.test_dir, "node_modules/some-lib"), exist_ok=True)
-        os.makedirs(os.path.join(self.test_dir, ".github/workflows"), exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        """Tworzy raz wzorcowe drzewo projektu z repozytorium Git, kopiowane do każdego testu."""
+        cls._template_tmp = tempfile.TemporaryDirectory()
+        cls.template_dir = cls._template_tmp.name
+        os.makedirs(os.path.join(cls.template_dir, "src"))
+        os.makedirs(os.path.join(cls.template_dir, ".venv/lib"))
+        os.makedirs(os.path.join(cls.template_dir, "node_modules/some-lib"))
+        os.makedirs(os.path.join(cls.template_dir, ".github/workflows"))
 
-        # Podstawowa konfiguracja (będzie modyfikowana w poszczególnych testach)
-        with open(os.path.join(self.test_dir, helpers.CONFIG_FILENAME), "w") as f:
-            f.write(f"""
-output_dir: {os.path.join(self.test_dir, '.dump-outputs')}
-blacklisted_paths:
-  - ".venv/"
-  - "*.lock"
-whitelisted_paths:
-  - ".github/workflows/main.yaml"
-""")
-        
         # Podstawowe pliki
-        with open(os.path.join(self.test_dir, "src/main.py"), "w") as f: 
+        with open(os.path.join(cls.template_dir, "src/main.py"), "w") as f: 
             f.write("print('hello')\n# line 2")
-        with open(os.path.join(self.test_dir, "package.json"), "w") as f: 
+        with open(os.path.join(cls.template_dir, "package.json"), "w") as f: 
             f.write("{}")
-        with open(os.path.join(self.test_dir, "node_modules/some-lib/index.js"), "w") as f: 
+        with open(os.path.join(cls.template_dir, "node_modules/some-lib/index.js"), "w") as f: 
             f.write("// lib")
-        with open(os.path.join(self.test_dir, ".venv/lib/a.py"), "w") as f: 
+        with open(os.path.join(cls.template_dir, ".venv/lib/a.py"), "w") as f: 
             f.write("# venv file")
-        with open(os.path.join(self.test_dir, "yarn.lock"), "w") as f: 
+        with open(os.path.join(cls.template_dir, "yarn.lock"), "w") as f: 
             f.write("lock file")
-        with open(os.path.join(self.test_dir, ".github/workflows/main.yaml"), "w") as f: 
+        with open(os.path.join(cls.template_dir, ".github/workflows/main.yaml"), "w") as f: 
             f.write("name: CI")
 
         # Inicjalizacja repo git
-        subprocess.run(["git", "init"], cwd=self.test_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        with open(os.path.join(self.test_dir, ".gitignore"), "w") as f:
+        subprocess.run(["git", "init"], cwd=cls.template_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(os.path.join(cls.template_dir, ".gitignore"), "w") as f:
             f.write("node_modules/\n")
         
-        subprocess.run(["git", "add", ".gitignore"], cwd=self.test_dir, stdout=subprocess.DEVNULL)
+        subprocess.run(["git", "add", ".gitignore"], cwd=cls.template_dir, stdout=subprocess.DEVNULL)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._template_tmp.cleanup()
+
+    def setUp(self):
+        """Kopiuje wzorcowe drzewo projektu i zapisuje konfigurację do testów."""
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_project_repo_")
+        self.test_dir = os.path.realpath(self._tmp.name)
+        shutil.copytree(self.template_dir, self.test_dir, dirs_exist_ok=True)
+
+        # Podstawowa konfiguracja (będzie modyfikowana w poszczególnych testach)
+        with open(os.path.join(self.test_dir, helpers.CONFIG_FILENAME), "w") as f:
+            f.write(f"""
+output_dir: {os.path.join(self.test_dir, '.dump-outputs')}
+blacklisted_paths:
+  - ".venv/"
+  - "*.lock"
+whitelisted_paths:
+  - ".github/workflows/main.yaml"
+""")
 
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
 
-        # Przechwytywanie logów
-        self.log_stream = StringIO()
-        self.stream_handler = logging.StreamHandler(self.log_stream)
-        self.logger_to_capture = logging.getLogger('ai_tools')
-        self.logger_to_capture.addHandler(self.stream_handler)
-        self.repo_logger = logging.getLogger('ai_tools.repo')
-        self.repo_logger.addHandler(self.stream_handler)
-        self.logger_to_capture.setLevel(logging.INFO)
-        self.repo_logger.setLevel(logging.INFO)
-
     def tearDown(self):
-        self.logger_to_capture.removeHandler(self.stream_handler)
-        self.repo_logger.removeHandler(self.stream_handler)
         os.chdir(self.original_cwd)
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
 
     def _write_config(self, config_content):
         """Pomocnicza funkcja do nadpisywania konfiguracji."""
@@ -189,6 +188,73 @@ whitelisted_paths:
         self.assertIn("File: node_modules/important.js", output)
         self.assertIn("File: node_modules/some-lib/index.js", output)
 
+    # TEST 3c: Katalog gitignored z plikiem pasującym do wildcarda z whitelist
+    @patch('ai_tools.cli.dump_repo.pyperclip', MagicMock())
+    def test_gitignored_directory_with_whitelisted_wildcard_included(self):
+        """Testuje, czy wildcard z whitelist znajduje pliki w katalogu gitignored."""
+        self._write_config("""
+output_dir: .dump-outputs
+blacklisted_paths: []
+whitelisted_paths:
+  - "*.js"
+""")
+        
+        with patch.object(sys, 'argv', ['dump-repo']):
+            result_code = repo.main()
+            self.assertEqual(result_code, 0)
+
+        output = repo.pyperclip.copy.call_args[0][0]
+        
+        self.assertIn("File: node_modules/some-lib/index.js", output)
+
+    def test_list_ignored_dirs(self):
+        """Testuje, czy katalogi ignorowane w całości są wykrywane jednym wywołaniem gita."""
+        ignored = repo._list_ignored_dirs(self.test_dir)
+        self.assertEqual(ignored, {os.path.join(self.test_dir, "node_modules")})
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo') and hasattr(os, 'symlink'), "wymaga mkfifo i symlink")
+    def test_scan_project_files_skips_pruned_dirs_and_special_files(self):
+        """Testuje, czy skanowanie pomija przycięte katalogi, dowiązania do katalogów i FIFO."""
+        os.symlink(os.path.join(self.test_dir, "src"), os.path.join(self.test_dir, "src_link"))
+        os.mkfifo(os.path.join(self.test_dir, "pipe"))
+
+        files = repo._scan_project_files(self.test_dir, lambda rel_dir: rel_dir == "node_modules")
+        rel_files = {os.path.relpath(p, self.test_dir) for p in files}
+
+        self.assertIn(os.path.join("src", "main.py"), rel_files)
+        self.assertIn(os.path.join(".venv", "lib", "a.py"), rel_files)
+        self.assertNotIn(os.path.join("node_modules", "some-lib", "index.js"), rel_files)
+        self.assertNotIn(os.path.join("src_link", "main.py"), rel_files)
+        self.assertNotIn("pipe", rel_files)
+
+    def test_without_whitelist_disk_scan_is_skipped(self):
+        """Testuje, czy bez whitelist lista plików pochodzi z gita, bez skanowania dysku."""
+        with open(os.path.join(self.test_dir, "deleted.py"), "w") as f: f.write("# tracked")
+        subprocess.run(["git", "add", "deleted.py"], cwd=self.test_dir, stdout=subprocess.DEVNULL)
+        os.remove(os.path.join(self.test_dir, "deleted.py"))
+        config = {'blacklisted_paths': [".venv/", "*.lock"], 'whitelisted_paths': []}
+
+        with patch.object(repo, '_scan_project_files') as scan:
+            files = repo.get_files_to_dump(['.'], self.test_dir, self.test_dir, self.test_dir, config)
+
+        scan.assert_not_called()
+        self.assertEqual(
+            [os.path.relpath(p, self.test_dir) for p in files],
+            [os.path.join(".github", "workflows", "main.yaml"), "package.json", os.path.join("src", "main.py")]
+        )
+
+    def test_scan_paths_limit_scope(self):
+        """Testuje, czy podane ścieżki (katalog i plik) ograniczają zakres dumpu."""
+        subprocess.run(["git", "add", "."], cwd=self.test_dir, stdout=subprocess.DEVNULL)
+        config = {'blacklisted_paths': [".venv/", "*.lock"], 'whitelisted_paths': []}
+
+        files = repo.get_files_to_dump(['src', 'package.json'], self.test_dir, self.test_dir, self.test_dir, config)
+
+        self.assertEqual(
+            [os.path.relpath(p, self.test_dir) for p in files],
+            ["package.json", os.path.join("src", "main.py")]
+        )
+
     # TEST 4: Pliki są w obu listach - błąd/ostrzeżenie
     @patch('ai_tools.cli.dump_repo.pyperclip', MagicMock())
     def test_conflicting_whitelist_blacklist_warning(self):
@@ -204,14 +270,15 @@ whitelisted_paths:
         subprocess.run(["git", "add", "src/main.py"], cwd=self.test_dir, stdout=subprocess.DEVNULL)
         
         # Oczekujemy SystemExit, bo log_error() kończy program
-        with self.assertRaises(SystemExit) as cm:
-            with patch.object(sys, 'argv', ['dump-repo']):
-                repo.main()
+        with self.assertLogs('ai_tools', level='INFO') as log_cm:
+            with self.assertRaises(SystemExit) as cm:
+                with patch.object(sys, 'argv', ['dump-repo']):
+                    repo.main()
         
         # Sprawdź kod wyjścia
         self.assertEqual(cm.exception.code, 1)
         
-        logs = self.log_stream.getvalue()
+        logs = "\n".join(record.getMessage() for record in log_cm.records)
         
         # Sprawdzamy czy jest błąd o konflikcie
         self.assertTrue(
@@ -236,14 +303,15 @@ whitelisted_paths:
         subprocess.run(["git", "add", "src/main.py"], cwd=self.test_dir, stdout=subprocess.DEVNULL)
         
         # Oczekujemy SystemExit, bo log_error() kończy program
-        with self.assertRaises(SystemExit) as cm:
-            with patch.object(sys, 'argv', ['dump-repo']):
-                repo.main()
+        with self.assertLogs('ai_tools', level='INFO') as log_cm:
+            with self.assertRaises(SystemExit) as cm:
+                with patch.object(sys, 'argv', ['dump-repo']):
+                    repo.main()
         
         # Sprawdź kod wyjścia
         self.assertEqual(cm.exception.code, 1)
         
-        logs = self.log_stream.getvalue()
+        logs = "\n".join(record.getMessage() for record in log_cm.records)
         
         # Sprawdzamy czy jest błąd o konflikcie
         # Powinno być wykryte, że "src" i "src/" to ten sam katalog
@@ -8,38 +8,49 @@ from unittest.mock import patch, MagicMock
 
 from ai_tools.cli import dump_repo as repo
 from ai_tools.utils import helpers
-from ai_tools.utils.temp_storage import parse_dump_file, get_dump_by_ref
+from ai_tools.utils.temp_storage import parse_dump_file, get_dump_by_ref, write_dump_file
 
 
 class TestRestoreFunctionality(unittest.TestCase):
     """Testy funkcji restore dla dump-repo"""
     
-    def setUp(self):
-        """Tworzy tymczasową strukturę katalogów i repozytorium Git."""
-        self.test_dir = os.path.abspath("test_project_restore")
-        os.makedirs(os.path.join(self.test_dir, "src"), exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        """Tworzy raz wzorcowy projekt z repozytorium Git, kopiowany do każdego testu."""
+        cls._template_tmp = tempfile.TemporaryDirectory()
+        cls.template_dir = cls._template_tmp.name
+        os.makedirs(os.path.join(cls.template_dir, "src"))
         
-        # Konfiguracja z explicite output_dir dla testów
-        with open(os.path.join(self.test_dir, helpers.CONFIG_FILENAME), "w") as f:
-            f.write(f"output_dir: {os.path.join(self.test_dir, '.dump-outputs')}\n")
+        # Względny output_dir, żeby konfiguracja we wzorcu nie zależała od katalogu testu
+        with open(os.path.join(cls.template_dir, helpers.CONFIG_FILENAME), "w") as f:
+            f.write("output_dir: .dump-outputs\n")
         
         # Utwórz testowe pliki
-        with open(os.path.join(self.test_dir, "src/app.py"), "w") as f:
+        with open(os.path.join(cls.template_dir, "src/app.py"), "w") as f:
             f.write("# Original content\nprint('original')\n")
-        with open(os.path.join(self.test_dir, "config.json"), "w") as f:
+        with open(os.path.join(cls.template_dir, "config.json"), "w") as f:
             f.write('{"version": "1.0"}\n')
         
         # Inicjalizuj Git repo
-        subprocess.run(["git", "init"], cwd=self.test_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        subprocess.run(["git", "add", "."], cwd=self.test_dir, stdout=subprocess.DEVNULL)
+        subprocess.run(["git", "init"], cwd=cls.template_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(["git", "add", "."], cwd=cls.template_dir, stdout=subprocess.DEVNULL)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._template_tmp.cleanup()
+    
+    def setUp(self):
+        """Kopiuje wzorcowy projekt z repozytorium Git."""
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_project_restore_")
+        self.test_dir = os.path.realpath(self._tmp.name)
+        shutil.copytree(self.template_dir, self.test_dir, dirs_exist_ok=True)
         
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
     
     def tearDown(self):
         os.chdir(self.original_cwd)
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     @patch('ai_tools.cli.dump_repo.pyperclip', MagicMock())
     def test_restore_from_dump(self):
@@ -247,6 +258,24 @@ another file content
         
         shutil.rmtree(dump_dir)
 
+    def test_write_dump_file_round_trip(self):
+        """Test że zapisany dump jest identyczny z tekstem dla schowka i da się go sparsować."""
+        dump_dir = tempfile.mkdtemp()
+        dump_file = os.path.join(dump_dir, "written-dump.txt")
+        parts = [
+            "---\nFile: a.py\n---\n```python\nprint('a')\n```",
+            "---\nFile: b.txt\n---\n```text\nb\n```",
+        ]
+
+        dump_text = write_dump_file(dump_file, parts)
+
+        self.assertEqual(dump_text, "\n\n".join(parts))
+        with open(dump_file, encoding='utf-8') as f:
+            self.assertEqual(f.read(), dump_text)
+        self.assertEqual(parse_dump_file(dump_file), [("a.py", "print('a')"), ("b.txt", "b")])
+
+        shutil.rmtree(dump_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
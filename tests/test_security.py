@@ -81,6 +81,16 @@ class TestEnvParsing(unittest.TestCase):
         self.assertIn("secret123", values)
         self.assertEqual(len(values), 1)
     
+    def test_parse_env_keeps_unicode_separators_inside_values(self):
+        """Test że znaki typu \\x0c czy \\u2028 w wartości nie dzielą jej na części"""
+        with open(self.env_file, 'w', encoding='utf-8', newline='') as f:
+            f.write("API_KEY=abc\x0cdef\u2028ghi\r\n")
+            f.write("DB_PASS=password456\rOTHER=value789\n")
+        
+        values = parse_env_file(self.env_file)
+        
+        self.assertEqual(values, {"abc\x0cdef\u2028ghi", "password456", "value789"})
+    
     def test_parse_nonexistent_file(self):
         """Test parsowania nieistniejącego pliku"""
         values = parse_env_file("/nonexistent/file.env")
@@ -141,7 +151,16 @@ class TestMaskSensitiveValues(unittest.TestCase):
         
         # Wszystkie warianty powinny być zamaskowane
         self.assertEqual(result.count("[HIDDEN_ENV_VALUE]"), 3)
-    
+
+    def test_mask_non_ascii_content_and_values(self):
+        """Test maskowania gdy treść lub wartość zawiera znaki spoza ASCII"""
+        content = "hasło: ZAŻÓŁĆ123 oraz token secret123"
+        sensitive = {"zażółć123", "secret123"}
+
+        result = mask_sensitive_values(content, sensitive)
+
+        self.assertEqual(result, "hasło: [HIDDEN_ENV_VALUE] oraz token [HIDDEN_ENV_VALUE]")
+
     def test_mask_empty_sensitive_set(self):
         """Test z pustym zestawem wrażliwych wartości"""
         content = "no secrets here"